@@ -0,0 +1,291 @@
+# ============================== #
+#        READ-ONLY DATA API     #
+# ============================== #
+
+# League standings as JSON or CSV over plain HTTP, for partner sites and
+# signage screens that only need the numbers, not the page:
+#
+#   python api_server.py --port 8502
+#
+#   /api/leagues                               leagues, League Numbers, weeks
+#   /api/weeks/<week>.json|.csv                every league that week
+#   /api/weeks/<week>/leagues/<number>.json|.csv   the league(s) with that
+#                                              League Number that week
+#
+# JSON week and league bodies are always {"week": ..., "leagues": [...]}:
+# leagues that share a League Number (and so an icon set) all come back for it.
+# Rows come from the same DataIngestor, validation and LeagueTable as the app,
+# so new results show up here as they do on the page. Teams are listed best
+# first, the chart's top-to-bottom order.
+# Bodies are cached per (week, league, row fingerprints, format) along with a
+# gzipped copy and their ETags, so a repeat request does no pandas work. The
+# gzipped copy has its own ETag ("...-gz"), and a matching If-None-Match for
+# either gets a 304. The cache is LIONHEART_CACHE when that is set, shared with
+# the app's replicas, and a private in-memory one otherwise.
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import logging
+import re
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+import pandas as pd
+
+from ingest import DataIngestor
+from league_data import PAGE_COLUMNS
+from shared_cache import MemoryBackend, SharedCache, shared_cache
+from validate import TARGET_COLUMN
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8502
+DEFAULT_MAX_AGE = 30
+CACHE_TTL = 24 * 3600
+GZIP_MIN_BYTES = 512
+
+CONTENT_TYPES = {"json": "application/json", "csv": "text/csv; charset=utf-8"}
+ROUTES = [
+    (re.compile(r"^/api/leagues/?$"), "leagues"),
+    (re.compile(r"^/api/weeks/(\d+)\.(json|csv)$"), "week"),
+    (re.compile(r"^/api/weeks/(\d+)/leagues/(\d+)\.(json|csv)$"), "league"),
+]
+
+
+# ============================== #
+#          RESPONSE BODIES      #
+# ============================== #
+
+# --- Standings for one league in one week as plain records, best first ---
+def league_records(table, week, league):
+    rows = table.slice(week, league)
+    standings = table.standings.slice(week, league)
+    frame = pd.DataFrame({
+        "Week": int(week),
+        "League": league,
+        "League Number": int(table.league_to_number[league]),
+        "Rank": standings["Rank"].to_numpy(),
+        "Team Name": rows["Team Name"].astype(object).to_numpy(),
+        "% Distance Covered": rows["% Distance Covered"].to_numpy(dtype=float),
+        "Category": rows["Category"].astype(object).to_numpy() if "Category" in rows.columns else None,
+        "Change": standings["Change"].to_numpy(),
+        "Rank Change": pd.array(standings["Rank Change"].to_numpy(), dtype="Int64"),
+        "Best Week": standings["Best Week"].to_numpy(),
+    })
+    # LeagueTable rows run lowest % first, as the chart draws them bottom up
+    return frame.iloc[::-1].reset_index(drop=True)
+
+
+def _league_json(table, week, league, records):
+    target = table.slice(week, league)[TARGET_COLUMN].iloc[0] if TARGET_COLUMN in table.frame.columns else None
+    return {
+        "week": int(week),
+        "league": league,
+        "league_number": int(table.league_to_number[league]),
+        "target_miles": None if pd.isna(target) else float(target),
+        "teams": [
+            {
+                "rank": int(row["Rank"]),
+                "team": row["Team Name"],
+                "pct": float(row["% Distance Covered"]),
+                "category": None if pd.isna(row["Category"]) else row["Category"],
+                "change": None if pd.isna(row["Change"]) else float(row["Change"]),
+                "rank_change": None if pd.isna(row["Rank Change"]) else int(row["Rank Change"]),
+                "best_week": int(row["Best Week"]),
+            }
+            for row in records.to_dict("records")
+        ],
+    }
+
+
+# --- Body for leagues in one week: {"week", "leagues": [...]} however many there are ---
+def week_body(table, week, leagues, fmt):
+    frames = [league_records(table, week, league) for league in leagues]
+    if fmt == "csv":
+        buffer = io.StringIO()
+        pd.concat(frames, ignore_index=True).to_csv(buffer, index=False)
+        return buffer.getvalue().encode()
+    documents = [_league_json(table, week, league, records) for league, records in zip(leagues, frames)]
+    return json.dumps({"week": int(week), "leagues": documents}, ensure_ascii=False).encode()
+
+
+def leagues_body(table):
+    return json.dumps({
+        "weeks": table.weeks,
+        "leagues": [
+            {
+                "league": league,
+                "league_number": int(table.league_to_number[league]),
+                "weeks": [week for week in table.weeks if league in table.leagues_in_week(week)],
+            }
+            for league in table.leagues
+        ],
+    }, ensure_ascii=False).encode()
+
+
+# --- (body, gzipped body or None, ETag) ready to send ---
+def encode(body):
+    etag = f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+    compressed = gzip.compress(body, mtime=0) if len(body) >= GZIP_MIN_BYTES else None
+    return body, compressed, etag
+
+
+# --- The gzipped body is a different representation, so caches must not mix the two up ---
+def gzip_etag(etag):
+    return f'{etag[:-1]}-gz"'
+
+
+
+# ============================== #
+#              API              #
+# ============================== #
+
+class LeagueApi:
+    def __init__(self, ingestor, cache=None):
+        self.ingestor = ingestor
+        self.cache = cache or SharedCache(MemoryBackend(max_bytes=64 * 1024 * 1024), namespace="api")
+
+    # --- (status, content type, encoded response or error message) for a path ---
+    def respond(self, path):
+        table = self.ingestor.snapshot()
+        for pattern, route in ROUTES:
+            match = pattern.match(path)
+            if match:
+                return getattr(self, f"_{route}")(table, *match.groups())
+        return HTTPStatus.NOT_FOUND, None, "No such endpoint; try /api/leagues"
+
+    # --- Row fingerprints of league's weeks up to week: movement and best week look back over all of them ---
+    @staticmethod
+    def _history(table, week, league):
+        return tuple(table.fingerprint(past, league) for past in table.weeks
+                     if past <= week and league in table.leagues_in_week(past))
+
+    def _cached(self, key, compute):
+        return self.cache.get_or_compute("api", key, lambda: encode(compute()), ttl=CACHE_TTL)
+
+    def _leagues(self, table):
+        # League order and weeks only change on a reload or when a new week or league arrives
+        key = ("leagues", tuple(table.leagues), tuple(tuple(table.leagues_in_week(week)) for week in table.weeks))
+        return HTTPStatus.OK, CONTENT_TYPES["json"], self._cached(key, lambda: leagues_body(table))
+
+    def _week(self, table, week, fmt):
+        week = int(week)
+        leagues = table.leagues_in_week(week)
+        if not leagues:
+            return HTTPStatus.NOT_FOUND, None, f"No results for week {week}"
+        key = ("week", week, tuple((league, self._history(table, week, league)) for league in leagues), fmt)
+        return HTTPStatus.OK, CONTENT_TYPES[fmt], self._cached(key, lambda: week_body(table, week, leagues, fmt))
+
+    def _league(self, table, week, number, fmt):
+        week, number = int(week), int(number)
+        leagues = [league for league in table.leagues_in_week(week) if table.league_to_number[league] == number]
+        if not leagues:
+            return HTTPStatus.NOT_FOUND, None, f"No results for league {number} in week {week}"
+        # Leagues sharing an icon set share a number: all of them answer, as in the week body
+        key = ("league", week, tuple((league, self._history(table, week, league)) for league in leagues), fmt)
+        return HTTPStatus.OK, CONTENT_TYPES[fmt], self._cached(key, lambda: week_body(table, week, leagues, fmt))
+
+
+def _accepts_gzip(header):
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def _etag_matches(header, *etags):
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or any(etag in tags or f"W/{etag}" in tags for etag in etags)
+
+
+def make_handler(api, max_age=DEFAULT_MAX_AGE):
+    class Handler(BaseHTTPRequestHandler):
+        server_version = "LionheartAPI/1.0"
+
+        def do_GET(self):
+            self._serve(send_body=True)
+
+        def do_HEAD(self):
+            self._serve(send_body=False)
+
+        def _serve(self, send_body):
+            try:
+                status, content_type, result = api.respond(unquote(urlsplit(self.path).path))
+            except Exception:
+                logger.exception("Failed to answer %s", self.path)
+                status, content_type, result = HTTPStatus.INTERNAL_SERVER_ERROR, None, "Internal error"
+            if content_type is None:
+                self._send_error(status, result, send_body)
+                return
+
+            body, compressed, etag = result
+            use_gzip = compressed is not None and _accepts_gzip(self.headers.get("Accept-Encoding"))
+            payload, sent_etag = (compressed, gzip_etag(etag)) if use_gzip else (body, etag)
+            common = [("ETag", sent_etag), ("Cache-Control", f"public, max-age={max_age}"),
+                      ("Vary", "Accept-Encoding"), ("Access-Control-Allow-Origin", "*")]
+            # Either tag names the same content, whichever encoding the client last received
+            if _etag_matches(self.headers.get("If-None-Match"), etag, gzip_etag(etag)):
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                for name, value in common:
+                    self.send_header(name, value)
+                self.end_headers()
+                return
+
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            if use_gzip:
+                self.send_header("Content-Encoding", "gzip")
+            for name, value in common:
+                self.send_header(name, value)
+            self.end_headers()
+            if send_body:
+                self.wfile.write(payload)
+
+        def _send_error(self, status, message, send_body):
+            body = json.dumps({"error": message}).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", CONTENT_TYPES["json"])
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+
+    return Handler
+
+
+def serve(data_path="data.csv", drop_dir="data.d", images_dir="images", host="127.0.0.1", port=DEFAULT_PORT,
+          max_age=DEFAULT_MAX_AGE):
+    ingestor = DataIngestor(data_path, drop_dir, columns=PAGE_COLUMNS, images_dir=images_dir)
+    api = LeagueApi(ingestor, cache=shared_cache)
+    with ThreadingHTTPServer((host, port), make_handler(api, max_age)) as server:
+        print(f"Serving league data on http://{host}:{port}/api/leagues")
+        server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Read-only JSON/CSV API for the league tables.")
+    parser.add_argument("--data", default="data.csv", help="results file (default: data.csv)")
+    parser.add_argument("--drop-dir", default="data.d", help="folder of per-week CSVs (default: data.d)")
+    parser.add_argument("--images", default="images", help="runner icon folder (default: images)")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default: {DEFAULT_PORT})")
+    parser.add_argument("--max-age", type=int, default=DEFAULT_MAX_AGE,
+                        help=f"seconds clients may reuse a response before revalidating (default: {DEFAULT_MAX_AGE})")
+    args = parser.parse_args(argv)
+    try:
+        serve(args.data, args.drop_dir, args.images, args.host, args.port, args.max_age)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,54 @@
 # --- Imports ---
+import json
 import os
+from concurrent.futures import as_completed
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib as mpl
-from matplotlib import font_manager
 import streamlit as st
-from matplotlib.offsetbox import OffsetImage, AnnotationBbox
-import matplotlib.image as mpimg
+import icons
+from chart_cache import chart_cache
+from prerender import prerendered_charts
+from render_pool import RenderPool, DEFAULT_WORKERS, render_replay
+from shared_cache import shared_cache
+from archive import Season, SeasonArchive
+from league_data import PAGE_COLUMNS, week_labels
+from league_specs import league_chart_spec, spec_to_bytes, ICON_FETCH_WIDTH
+from icons import icon_store
+from profiling import RunProfile, env_enabled
+import assets
+import page_html
 
 # ============================== #
 #         STYLING SETUP         #
 # ============================== #
 
-# --- Load and set global font for Matplotlib ---
-font_path = "NotoSans-VariableFont_wdth,wght.ttf"
-font_prop = font_manager.FontProperties(fname=font_path)
-mpl.rcParams['font.family'] = font_prop.get_name()
+# --- Phase timings for this run (shown with ?debug=1 or LIONHEART_PROFILE=1) ---
+run_profile = RunProfile()
+
+# --- Seasons: the current one from data.csv/images/, past ones from seasons/<id>/ ---
+# Results data is shared by every session and updated in place as rows arrive:
+# new lines appended to data.csv, or new per-week CSVs dropped into data.d/, are
+# folded into the current table without a restart or a full re-parse.
+# LIONHEART_DATA can point at an .arrow file made by convert_data.py, which loads
+# faster than the CSV (no parsing); each process still holds its own table.
+current_season = Season("2025", "Lionheart 2025 HQ Hop", os.environ.get("LIONHEART_DATA", "data.csv"), drop_dir="data.d")
+
+@st.cache_resource(show_spinner=False)
+def get_archive():
+    return SeasonArchive(current_season, columns=PAGE_COLUMNS)
+
+archive = get_archive()
+season_ids = archive.season_ids()
+season_id = st.query_params.get("season", current_season.id)
+if season_id not in season_ids:
+    season_id = current_season.id
+season = archive.season(season_id)
 
 # --- Streamlit page configuration ---
-st.set_page_config(page_title="Lionheart 2025 HQ Hop League Tables", layout="wide")
+st.set_page_config(page_title=f"{season.title} League Tables", layout="wide")
 
 # --- Apply dark theme and custom font styling ---
-st.markdown("""
+with run_profile.phase("css"):
+    st.markdown("""
     <style>
         @font-face {
             font-family: 'Roboto Condensed';
@@ -45,8 +72,8 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# --- Increase font size for radio button labels ---
-st.markdown("""
+    # --- Increase font size for radio button labels ---
+    st.markdown("""
     <style>
         label[data-testid="stMarkdownContainer"] + div div[role="radiogroup"] label {
             font-size: 1.125rem !important;
@@ -59,182 +86,423 @@ st.markdown("""
 # ============================== #
 
 # --- Credits banner ---
-st.markdown("""
-    <div style='display: flex; justify-content: center; align-items: center; margin-top: 1.5rem; margin-bottom: 2.5rem; font-size: 16px; color: #CCCCCC;'>
-        <span>Designed by <strong>Kalungi Analytics</strong> · 
-            <a href='https://www.linkedin.com/in/ben-sharpe-49659a207/' target='_blank' style='color: #FF6B6B; text-decoration: none; margin-left: 4px;'>
-                Connect on LinkedIn
-            </a>
-        </span>
-    </div>
-""", unsafe_allow_html=True)
+with run_profile.phase("markdown", block="credits"):
+    st.markdown(page_html.CREDITS_HTML, unsafe_allow_html=True)
 
-# --- Display logo (use file path directly) ---
+# --- Display logo (resized, compressed variants instead of the full-size PNG) ---
 logo_path = "images/logo.png"
-if os.path.exists(logo_path):
-    st.image(logo_path, use_container_width=True)
-else:
-    st.warning("Logo not found.")
+with run_profile.phase("logo"):
+    if not os.path.exists(logo_path):
+        st.warning("Logo not found.")
+    elif st.get_option("server.enableStaticServing"):
+        # Browser picks the width it needs from static/ and caches it across reruns
+        st.markdown(assets.responsive_image_html(logo_path, alt="Lionheart Headquarter Hop"), unsafe_allow_html=True)
+    else:
+        st.image(assets.variant(logo_path, assets.FALLBACK_WIDTH), width="stretch")
 
 # --- Initial donate banner ---
-st.markdown("""
-    <div style='background-color:#3F1F5A; padding: 1.5rem; border-radius: 1rem; text-align: center; margin-bottom: 2rem;'>
-        <h2 style='color: white; margin-bottom: 1rem;'>Please consider donating to Lionheart to support the amazing efforts of our teams!</h2>
-        <a href='https://www.justgiving.com/team/sdl-lhh25' target='_blank' style='background-color: #FF6B6B; color: white; padding: 0.75rem 1.5rem; text-decoration: none; border-radius: 0.5rem; font-weight: bold; font-size: 1.1rem; display: inline-block;'>💖 Donate Now</a>
-    </div>
-""", unsafe_allow_html=True)
+with run_profile.phase("markdown", block="donate"):
+    st.markdown(page_html.DONATE_HTML, unsafe_allow_html=True)
 
 # ============================== #
 #        DATA LOADING SETUP     #
 # ============================== #
 
-# --- Load data with caching ---
-@st.cache_data(show_spinner=False)
-def load_data():
-    return pd.read_csv("data.csv")
+# --- Season picker, shown once past seasons are archived ---
+if len(season_ids) > 1:
+    st.selectbox(
+        "🏆 Season",
+        options=season_ids,
+        index=season_ids.index(season_id),
+        format_func=lambda i: archive.season(i).title,
+        key="season_select",
+        on_change=lambda: st.query_params.update(season=st.session_state.season_select),
+    )
 
-# --- Safe image loader with warning ---
+# --- Safe image loader with warning shown on the page ---
 def safe_load_image(path):
-    if os.path.exists(path):
-        return mpimg.imread(path)
-    else:
-        st.warning(f"Missing image: {path}")
-        return None
-
-# --- Load league-specific runner icons ---
-def load_league_images(league_number):
-    folder_path = os.path.join("images", str(league_number))
-    if not os.path.exists(folder_path):
-        return []
-    image_files = sorted([f for f in os.listdir(folder_path) if f.endswith(".png")])
-    return [safe_load_image(os.path.join(folder_path, f)) for f in image_files if safe_load_image(os.path.join(folder_path, f)) is not None]
+    return icons.safe_load_image(path, warn=st.warning)
 
 # --- Load all data and images ---
-df = load_data()
-flag_img = safe_load_image("images/checkered_flag.png")
-start_img = safe_load_image("images/start_icon.png")
-whistle_img = safe_load_image("images/whistle.png")
+with run_profile.phase("data_load"):
+    # Only this season is loaded; others stay on disk until someone opens them
+    ingestor = archive.ingestor(season_id)
+    previous_table = ingestor.table
+    table = ingestor.snapshot()
+    chart_cache.set_data_version(ingestor.base_version, namespace=season_id)
+run_profile.count("data_snapshot", hit=table is previous_table)
+
+# --- Banner icons: render workers load their own, this surfaces a missing file on the page ---
+with run_profile.phase("icons"):
+    icon_hits, icon_misses = icon_store.hits, icon_store.misses
+    flag_img = safe_load_image(icons.flag_path)
+    start_img = safe_load_image(icons.start_path)
+    whistle_img = safe_load_image(icons.whistle_path)
+# Store counters are process-wide, so under concurrent sessions these deltas are approximate
+run_profile.add_counts("icon_store", icon_store.hits - icon_hits, icon_store.misses - icon_misses)
 
 # --- Map League name to numeric ID ---
-league_to_number = df.drop_duplicates(subset=['League'])[['League', 'League Number']].set_index('League')['League Number'].to_dict()
+league_to_number = table.league_to_number
 
 # ============================== #
-#       PLOTTING FUNCTION        #
+#        CHART RENDERING        #
 # ============================== #
 
-def plot_league_data(league_df, league_name, flag_img, start_img, whistle_img):
-    df_sorted = league_df.sort_values(by="% Distance Covered").reset_index(drop=True)
-    league_number = league_to_number.get(league_name, 1)
-    runner_images = load_league_images(league_number)
-
-    if not runner_images or df_sorted.empty:
-        return plt.figure()
-
-    max_bars = 20
-    num_bars = min(len(df_sorted), max_bars)
-
-    fig, ax = plt.subplots(figsize=(14, 0.65 * num_bars))
-    fig.patch.set_facecolor('#171717')
-    ax.set_facecolor('#171717')
-    ax.axis('off')
-
-    bar_height = 0.7
-    y_positions = range(num_bars)
-    ax.barh(y=y_positions, width=df_sorted['% Distance Covered'][:num_bars], height=bar_height, color=(0, 0, 0, 0))
-
-    # --- Runner icons ---
-    for i, value in enumerate(df_sorted['% Distance Covered'][:num_bars]):
-        img = runner_images[i % len(runner_images)]
-        if img is not None:
-            icon = OffsetImage(img, zoom=0.05, resample=True)
-            ab = AnnotationBbox(icon, (value, i), frameon=False, box_alignment=(0.5, 0.5))
-            ax.add_artist(ab)
-
-    # --- Labels and values ---
-    for i, (value, name) in enumerate(zip(df_sorted['% Distance Covered'][:num_bars], df_sorted['Team Name'][:num_bars])):
-        ax.text(x=value - 2.5, y=i, s=name, ha='right', va='center',
-                fontsize=16, color='white', weight='bold', fontproperties=font_prop)
-        label_text = "" if value == 0 else f"{value:.1f}%"
-        label_color = '#80CFA9' if value >= 100 else '#FFD700' if value >= 85 else '#FF6B6B'
-        ax.text(x=value + 4.5, y=i, s=label_text, ha='left', va='center',
-                fontsize=14, color=label_color, fontproperties=font_prop)
-
-    max_value = df_sorted['% Distance Covered'][:num_bars].max()
-    ax.set_xlim(0, max(110, max_value + 5))
-    ax.set_ylim(-1, y_positions[-1] + 1.2)
-
-    start_y = num_bars - 0.5 + 0.2
-    ax.axvline(x=0, color='#eeeeee', linestyle='--', linewidth=0.75)
-    if whistle_img is not None:
-        ax.add_artist(AnnotationBbox(OffsetImage(whistle_img, zoom=0.05), (0, start_y), frameon=False, box_alignment=(0.5, 0)))
-    ax.axvline(x=100, color='#eeeeee', linestyle='--', linewidth=0.75)
-    if flag_img is not None:
-        ax.add_artist(AnnotationBbox(OffsetImage(flag_img, zoom=0.05), (102.5, start_y), frameon=False, box_alignment=(0.5, 0)))
-
-    return fig
+# --- Live renders go to a shared pool of worker processes (LIONHEART_RENDER_WORKERS=0 draws in-process) ---
+# With LIONHEART_CACHE set, charts drawn by any replica are shared through it.
+@st.cache_resource(show_spinner=False)
+def get_render_pool():
+    return RenderPool(int(os.environ.get("LIONHEART_RENDER_WORKERS", DEFAULT_WORKERS)), cache=shared_cache)
+
+render_pool = get_render_pool()
+
+# --- Rendered chart bytes, reused across reruns and sessions until the rows change ---
+# Falls back from the in-memory cache to baked files from prerender.py, and only
+# then to a live Matplotlib render. Returns (payload, None) when the chart is ready
+# and (None, job) when it is still being drawn.
+def request_league_chart(league_df, league_name, week, profile, fmt="png"):
+    fingerprint = table.fingerprint(week, league_name)
+    key = (season_id, week, league_name, fingerprint, fmt)
+
+    payload = chart_cache.get(key)
+    profile.count("chart_cache", hit=payload is not None)
+    if payload is not None:
+        return payload, None
+
+    # Baked charts are made from the current season's data and icons only
+    if season_id == current_season.id:
+        payload = prerendered_charts.read(week, league_name, fingerprint, fmt)
+        profile.count("prerendered", hit=payload is not None)
+        if payload is not None:
+            chart_cache.put(key, payload)
+            return payload, None
+
+    args = (league_df, league_name, league_to_number[league_name], season.images_dir, fmt)
+    if not render_pool.workers:
+        # Drawn right here: collect_league_chart records the plot and rasterise times, so no submit phase
+        return None, (key, render_pool.submit(key, *args), args, week)
+    with profile.phase("render_submit", league=league_name, week=week):
+        future = render_pool.submit(key, *args)
+    return None, (key, future, args, week)
+
+# --- Wait for a chart handed to the pool and cache it ---
+def collect_league_chart(job, profile):
+    key, future, args, week = job
+    league_name = args[1]
+    with profile.phase("render_wait", league=league_name, week=week):
+        payload, stats = render_pool.result(future, *args)
+    if shared_cache is not None:
+        profile.count("shared_cache", hit=stats["source"] != "render")
+    if stats["source"] == "render":
+        # Worker-side timings, so the debug panel still shows where the render went
+        profile.record("plot_league_data", stats["plot_ms"], league=league_name, week=week, pid=stats["pid"])
+        profile.record("rasterise", stats["rasterise_ms"], league=league_name, week=week, pid=stats["pid"])
+        profile.add_counts("icon_store", stats["icon_hits"], stats["icon_misses"])
+    chart_cache.put(key, payload)
+    return payload
+
+def render_league_chart(league_df, league_name, week, profile, fmt="png"):
+    payload, job = request_league_chart(league_df, league_name, week, profile, fmt)
+    return payload if job is None else collect_league_chart(job, profile)
+
+# --- Animated week-by-week replay of one league, cached until any of its weeks change ---
+# Drawn by the render pool like a chart; see race_replay.py for the incremental frames.
+def render_league_replay(league_name, profile):
+    weeks = [week for week in table.weeks if league_name in table.leagues_in_week(week)]
+    key = (season_id, "replay", league_name, tuple(table.fingerprint(week, league_name) for week in weeks), "gif")
+
+    payload = chart_cache.get(key)
+    profile.count("chart_cache", hit=payload is not None)
+    if payload is not None:
+        return payload
+
+    history = pd.concat([table.slice(week, league_name) for week in weeks], ignore_index=True)
+    args = (history, league_name, league_to_number[league_name], season.images_dir, "gif")
+    with profile.phase("race_replay", league=league_name):
+        payload, stats = render_pool.result(render_pool.submit(key, *args, task=render_replay), *args,
+                                            task=render_replay)
+    if stats["source"] == "render":
+        profile.record("replay_frames", stats["replay_ms"], league=league_name, pid=stats["pid"])
+    chart_cache.put(key, payload)
+    return payload
+
+# --- Fill chart placeholders in the order their renders finish ---
+def stream_league_charts(deferred, profile):
+    placeholders = {}
+    for job, placeholder in deferred:
+        _, future, _, _ = job
+        placeholders.setdefault(future, []).append((job, placeholder))
+    for future in as_completed(placeholders):
+        for job, placeholder in placeholders[future]:
+            _, _, (_, league_name, *_), week = job
+            chart = collect_league_chart(job, profile)
+            with profile.phase("st.image", league=league_name, week=week):
+                placeholder.image(chart, width="stretch")
+
+# --- Client-side charts: LIONHEART_CHART_BACKEND=vega sends a Vega-Lite spec instead of a PNG ---
+# The browser draws every team from a few KB of JSON; icons come from static/ when
+# static serving is on and are inlined as data: URIs otherwise.
+chart_backend = os.environ.get("LIONHEART_CHART_BACKEND", "matplotlib")
+static_serving = st.get_option("server.enableStaticServing")
+
+def icon_url(path):
+    if static_serving:
+        return assets.variant_url(path, ICON_FETCH_WIDTH)
+    return assets.data_uri(path, ICON_FETCH_WIDTH)
+
+def render_league_spec(league_df, league_name, week, profile):
+    fmt = "vega" if static_serving else "vega-inline"
+    key = (season_id, week, league_name, table.fingerprint(week, league_name), fmt)
+
+    payload = chart_cache.get(key)
+    profile.count("chart_cache", hit=payload is not None)
+    if payload is None:
+        with profile.phase("league_chart_spec", league=league_name, week=week):
+            payload = spec_to_bytes(league_chart_spec(league_df, league_name, league_to_number, icon_url,
+                                                      images_dir=season.images_dir))
+        chart_cache.put(key, payload)
+    return payload
+
+# --- Rank, movement arrows and trend for one league's week, read from the precomputed standings ---
+def show_league_standings(league_name, week, profile):
+    with profile.phase("standings", league=league_name, week=week):
+        st.dataframe(
+            table.standings.movement_table(week, league_name),
+            hide_index=True,
+            width="stretch",
+            column_config={
+                "%": st.column_config.NumberColumn(format="%.1f%%"),
+                "Δ pts": st.column_config.NumberColumn(format="%+.1f", help="% points gained since the previous week"),
+                "Best Week": st.column_config.NumberColumn(help="Week of the team's biggest gain so far"),
+            },
+        )
+
+# --- Chart with the standings table beside it ---
+def show_league(league_df, league_name, week, profile, deferred=None):
+    chart_column, standings_column = st.columns([3, 2])
+    with chart_column:
+        if st.toggle("▶ Race replay", key=f"replay_{league_name}", help="Every week so far, animated"):
+            replay = render_league_replay(league_name, profile)
+            if not replay:
+                st.info("No replay for this league.")
+            else:
+                st.image(replay, width="stretch")
+        else:
+            show_league_chart(league_df, league_name, week, profile, deferred)
+    with standings_column:
+        show_league_standings(league_name, week, profile)
+
+# --- Draw one league's chart with whichever backend is switched on ---
+# Given a deferred list, a chart still being drawn leaves a placeholder there for stream_league_charts
+def show_league_chart(league_df, league_name, week, profile, deferred=None):
+    if chart_backend == "vega":
+        spec = render_league_spec(league_df, league_name, week, profile)
+        with profile.phase("st.vega_lite_chart", league=league_name, week=week):
+            if spec == b"null":
+                st.info("No chart for this league.")
+            else:
+                st.vega_lite_chart(spec=json.loads(spec), width="stretch", theme=None)
+        return
+    chart, job = request_league_chart(league_df, league_name, week, profile)
+    if job is not None and deferred is not None:
+        deferred.append((job, st.empty()))
+        return
+    if job is not None:
+        chart = collect_league_chart(job, profile)
+    with profile.phase("st.image", league=league_name, week=week):
+        st.image(chart, width="stretch")
 
 # ============================== #
 #       INTERFACE LOGIC         #
 # ============================== #
 
 # --- Setup week options ---
-week_map = {week: f"Week {week}" for week in sorted(df['Week'].unique())}
+week_map = week_labels(table.weeks)
 inv_week_map = {v: k for k, v in week_map.items()}
 default_week = max(week_map.keys())
 
-# --- Initialize session state ---
-if "selected_week" not in st.session_state:
+# --- Initialize session state (a week missing from a newly picked season falls back too) ---
+if st.session_state.get("selected_week") not in week_map:
     st.session_state.selected_week = default_week
 
-# --- Filter data ---
+# --- Current week ---
 current_week = st.session_state.selected_week
-df = df[df["Week"] == current_week]
 
 # --- Headline ---
-st.markdown(f"<h1 style='text-align:center; margin-top:-1rem;'>League Tables – Week {current_week}</h1>", unsafe_allow_html=True)
+with run_profile.phase("markdown", block="headline"):
+    season_label = "" if season_id == current_season.id else f"{season.title} · "
+    st.markdown(f"<h1 style='text-align:center; margin-top:-1rem;'>{season_label}League Tables – Week {current_week}</h1>", unsafe_allow_html=True)
 
 # ============================== #
-#       DISPLAY EACH LEAGUE     #
+#          TEAM SEARCH          #
 # ============================== #
 
-for league in df['League'].unique():
-    st.markdown(f"## {league}")
+# --- Find one team: only its league is drawn, the rest of the page is skipped ---
+with run_profile.phase("team_search"):
+    team_query = st.text_input("🔎 Find your team", key="team_query", placeholder="Start typing a team name")
+    team_matches = table.team_index.search(team_query) if team_query.strip() else []
+    picked_team = None
+    if team_query.strip() and not team_matches:
+        st.info(f"No team matches “{team_query.strip()}”.")
+    elif len(team_matches) == 1:
+        picked_team = team_matches[0]
+    elif team_matches:
+        picked = st.selectbox(
+            "Matching teams",
+            options=range(len(team_matches)),
+            format_func=lambda i: (f"{team_matches[i]['team'].strip()} — {team_matches[i]['league']}"
+                                   f" · latest Week {team_matches[i]['week']}"),
+            key="team_pick",
+        )
+        picked_team = team_matches[picked]
+
+# ============================== #
+#         ROLLUP BOARDS         #
+# ============================== #
+
+# --- Category and League leaderboards, looked up from boards built once per data version ---
+rollup_columns = {
+    "Mean": st.column_config.NumberColumn(format="%.1f%%"),
+    "Median": st.column_config.NumberColumn(format="%.1f%%"),
+    "≥ 85%": st.column_config.NumberColumn(format="%.0f%%", help="Share of teams at 85% of target or more"),
+    "≥ 100%": st.column_config.NumberColumn(format="%.0f%%", help="Share of teams at or past their target"),
+    "Δ Mean": st.column_config.NumberColumn(format="%+.1f", help="% points since the previous week"),
+    "Δ ≥ 100%": st.column_config.NumberColumn(format="%+.0f", help="Change in the share past target since the previous week"),
+}
+
+@st.fragment
+def rollup_section():
+    with st.expander("📊 Category & league rollups", key="rollups_open", on_change="rerun") as section:
+        if not section.open:
+            return
+        # Its own week choice: in lazy mode the league radios only rerun their own fragments
+        week = st.radio(
+            label="📅 Select Week",
+            options=list(week_map.keys()),
+            index=list(week_map.keys()).index(st.session_state.selected_week),
+            format_func=week_map.get,
+            horizontal=True,
+            key="rollups_week",
+        )
+        for tab, level in zip(st.tabs(["By category", "By league"]), ["Category", "League"]):
+            with tab:
+                st.dataframe(table.rollups.board(level, week), hide_index=True, width="stretch",
+                             column_config=rollup_columns)
+
+rollup_section()
+
+# ============================== #
+#       DISPLAY EACH LEAGUE     #
+# ============================== #
 
-    selected_label = st.radio(
+# --- Debug timing panel switch ---
+show_profile = env_enabled() or st.query_params.get("debug") == "1"
+
+# --- Lazy mode: each league is its own fragment, rendered only once opened ---
+# Set LIONHEART_LAZY_LEAGUES=0 for the original page, where one week radio drives every league.
+lazy_leagues = os.environ.get("LIONHEART_LAZY_LEAGUES", "1") != "0"
+eager_leagues = 1
+
+@st.fragment
+def league_section(league, expanded):
+    # A fragment-only rerun happens after the page run has finished, so it gets its own profile
+    profile = run_profile if not run_profile.finished else RunProfile("fragment")
+    try:
+        with st.expander("Show league table", expanded=expanded, key=f"league_open_{league}", on_change="rerun") as section:
+            if not section.open:
+                return
+
+            # Reruns triggered here only rerun this fragment, not the other leagues
+            selected_label = st.radio(
+                label="📅 Select Week",
+                options=list(week_map.values()),
+                index=list(week_map.keys()).index(st.session_state.selected_week),
+                horizontal=True,
+                key=f"week_radio_{league}",
+            )
+            week = inv_week_map[selected_label]
+
+            league_df = table.slice(week, league)
+            if league_df.empty:
+                st.info(f"No results for {selected_label}.")
+                return
+            show_league(league_df, league, week, profile)
+    finally:
+        if profile is not run_profile:
+            profile.finish()
+            if show_profile:
+                st.caption(f"⏱ {profile.total_ms:.1f} ms · {dict(profile.counters)}")
+                profile.log(league=league)
+
+if picked_team is not None:
+    # Any week the team has a result in; the week being viewed if it has one, otherwise its latest
+    team, league = picked_team["team"], picked_team["league"]
+    team_weeks = table.team_index.weeks(team, league)
+    week = st.radio(
         label="📅 Select Week",
-        options=list(week_map.values()),
-        index=list(week_map.keys()).index(st.session_state.selected_week),
+        options=team_weeks,
+        index=team_weeks.index(current_week) if current_week in team_weeks else len(team_weeks) - 1,
+        format_func=week_map.get,
         horizontal=True,
-        key=f"week_radio_{league}",
-        on_change=lambda l=league: st.session_state.update(
-            selected_week=inv_week_map[st.session_state[f"week_radio_{l}"]]
-        ),
+        key=f"team_week_{league}_{team}",
     )
+    standing = table.team_index.standing(team, league, week)
+    st.markdown(f"## {league}")
+    st.markdown(f"**{team.strip()}** · Week {week} · Rank {standing['rank']} of {standing['teams']} · "
+                f"{standing['pct']:.1f}% of target")
+    show_league(table.slice(week, league), league, week, run_profile)
+
+elif lazy_leagues:
+    for i, league in enumerate(table.leagues):
+        st.markdown(f"## {league}")
+        league_section(league, expanded=i < eager_leagues)
 
-    league_df = df[df["League"] == league]
-    fig = plot_league_data(league_df, league, flag_img, start_img, whistle_img)
-    st.pyplot(fig)
-    plt.close(fig)
+else:
+    # Every league's render is queued before any is waited on, then each chart appears as it finishes
+    deferred = []
+    for league in table.leagues_in_week(current_week):
+        st.markdown(f"## {league}")
+
+        selected_label = st.radio(
+            label="📅 Select Week",
+            options=list(week_map.values()),
+            index=list(week_map.keys()).index(st.session_state.selected_week),
+            horizontal=True,
+            key=f"week_radio_{league}",
+            on_change=lambda l=league: st.session_state.update(
+                selected_week=inv_week_map[st.session_state[f"week_radio_{l}"]]
+            ),
+        )
+
+        league_df = table.slice(current_week, league)
+        show_league(league_df, league, current_week, run_profile, deferred)
+    stream_league_charts(deferred, run_profile)
 
 # ============================== #
 #   FINAL DONATE & ATTRIBUTION  #
 # ============================== #
 
 # --- Final donate banner ---
-st.markdown("""
-    <div style='background-color:#3F1F5A; padding: 1.5rem; border-radius: 1rem; text-align: center; margin-bottom: 2rem;'>
-        <h2 style='color: white; margin-bottom: 1rem;'>Please consider donating to Lionheart to support the amazing efforts of our teams!</h2>
-        <a href='https://www.justgiving.com/team/sdl-lhh25' target='_blank' style='background-color: #FF6B6B; color: white; padding: 0.75rem 1.5rem; text-decoration: none; border-radius: 0.5rem; font-weight: bold; font-size: 1.1rem; display: inline-block;'>💖 Donate Now</a>
-    </div>
-""", unsafe_allow_html=True)
+with run_profile.phase("markdown", block="final_donate"):
+    st.markdown(page_html.DONATE_HTML, unsafe_allow_html=True)
 
 # --- Final credits ---
-st.markdown("""
-    <div style='display: flex; justify-content: center; align-items: center; margin-top: 1.5rem; margin-bottom: 2.5rem; font-size: 16px; color: #CCCCCC;'>
-        <span>Designed by <strong>Kalungi Analytics</strong> · 
-            <a href='https://www.linkedin.com/in/ben-sharpe-49659a207/' target='_blank' style='color: #FF6B6B; text-decoration: none; margin-left: 4px;'>
-                Connect on LinkedIn
-            </a>
-        </span>
-    </div>
-""", unsafe_allow_html=True)
+with run_profile.phase("markdown", block="final_credits"):
+    st.markdown(page_html.CREDITS_HTML, unsafe_allow_html=True)
+
+# ============================== #
+#       DEBUG TIMING PANEL      #
+# ============================== #
+
+run_profile.finish()
+if show_profile:
+    with st.expander("⏱ Run timings"):
+        st.caption(f"Total {run_profile.total_ms:.1f} ms")
+        st.dataframe(run_profile.phases, width="stretch")
+        st.json(dict(run_profile.counters))
+        st.caption("Data validation at the last load")
+        st.json(ingestor.report.to_dict())
+        if render_pool.figure_stats:
+            st.caption("Figures and image memory per render process")
+            st.json(render_pool.figure_stats)
+    run_profile.log()
@@ -0,0 +1,120 @@
+# ============================== #
+#         SEASON ARCHIVE        #
+# ============================== #
+
+# Past seasons (or other events) hosted next to the current one. Each lives
+# in its own folder with its own results and league icon sets:
+#
+#   seasons/2024/season.json     {"title": "Lionheart 2024 HQ Hop"}  (optional)
+#   seasons/2024/data.csv        or data.arrow / data.parquet
+#   seasons/2024/images/<n>/     runner icons for league <n>
+#
+# Listing seasons only reads folder names; a season's metadata, data and
+# icons are loaded the first time it is opened. At most max_resident seasons
+# stay loaded, least recently viewed first out; the current season is never
+# evicted.
+
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from chart_cache import chart_cache
+from icons import icon_store, league_image_paths
+from ingest import DataIngestor
+
+ARCHIVE_DIR = "seasons"
+SEASON_FILE = "season.json"
+DATA_NAMES = ("data.arrow", "data.feather", "data.parquet", "data.csv")
+MAX_RESIDENT_SEASONS = 2
+
+
+class Season:
+    def __init__(self, season_id, title, data_path, drop_dir=None, images_dir="images"):
+        self.id = season_id
+        self.title = title
+        self.data_path = data_path
+        self.drop_dir = drop_dir
+        self.images_dir = images_dir
+
+    # --- Season stored under archive_dir/<season_id>/ ---
+    @classmethod
+    def from_folder(cls, folder, season_id):
+        metadata = {}
+        metadata_path = os.path.join(folder, SEASON_FILE)
+        if os.path.exists(metadata_path):
+            with open(metadata_path, encoding="utf-8") as f:
+                metadata = json.load(f)
+
+        data_name = metadata.get("data") or next(
+            (name for name in DATA_NAMES if os.path.exists(os.path.join(folder, name))), "data.csv")
+        return cls(
+            season_id,
+            metadata.get("title", season_id),
+            os.path.join(folder, data_name),
+            drop_dir=os.path.join(folder, metadata.get("drop_dir", "data.d")),
+            images_dir=os.path.join(folder, metadata.get("images", "images")),
+        )
+
+
+class SeasonArchive:
+    def __init__(self, current, archive_dir=ARCHIVE_DIR, max_resident=MAX_RESIDENT_SEASONS, columns=None):
+        self.current = current
+        self.archive_dir = archive_dir
+        self.max_resident = max(1, max_resident)
+        self.columns = columns
+        self._seasons = {current.id: current}
+        self._resident = OrderedDict()
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+    # --- Current season first, then archived ones newest first (by folder name) ---
+    def season_ids(self):
+        archived = []
+        if os.path.isdir(self.archive_dir):
+            archived = sorted((name for name in os.listdir(self.archive_dir)
+                               if name != self.current.id and os.path.isdir(os.path.join(self.archive_dir, name))),
+                              reverse=True)
+        return [self.current.id] + archived
+
+    def season(self, season_id):
+        season = self._seasons.get(season_id)
+        if season is None:
+            folder = os.path.join(self.archive_dir, season_id)
+            if not os.path.isdir(folder):
+                raise KeyError(season_id)
+            season = self._seasons[season_id] = Season.from_folder(folder, season_id)
+        return season
+
+    # --- Ingestor for a season, loading it (and evicting the stalest) on first use ---
+    def ingestor(self, season_id):
+        with self._lock:
+            ingestor = self._resident.get(season_id)
+            if ingestor is not None:
+                self._resident.move_to_end(season_id)
+                return ingestor
+
+            season = self.season(season_id)
+            ingestor = DataIngestor(season.data_path, season.drop_dir, columns=self.columns, images_dir=season.images_dir)
+            self._resident[season_id] = ingestor
+            self.loads += 1
+            self._evict()
+            return ingestor
+
+    def _evict(self):
+        while len(self._resident) > self.max_resident:
+            stale = next((season_id for season_id in self._resident if season_id != self.current.id), None)
+            if stale is None:
+                return
+            ingestor = self._resident.pop(stale)
+            self.evictions += 1
+            # Free what the season pulled into the process-wide stores along with its table
+            chart_cache.discard_namespace(stale)
+            images_dir = self._seasons[stale].images_dir
+            for league_number in set(ingestor.table.league_to_number.values()):
+                for path in league_image_paths(league_number, images_dir):
+                    icon_store.discard(path)
+
+    def resident(self):
+        return list(self._resident)
@@ -0,0 +1,116 @@
+# ============================== #
+#     RESPONSIVE ASSET PIPELINE  #
+# ============================== #
+
+# Width-appropriate, compressed copies of large page images (the logo is a
+# 5868x2441 PNG). Variants are generated on first use into static/assets/,
+# named after a hash of the source so an edited source gets fresh files and
+# browsers can cache each name indefinitely.
+#
+# With server.enableStaticServing on, the page emits a <picture> srcset and
+# the browser fetches only the width it needs, once. Without it, the page
+# falls back to st.image on a single mid-size WebP. Both formats are written
+# from one 256-colour palette image (lossless WebP plus an optimised PNG).
+
+import base64
+import hashlib
+import os
+import threading
+
+from PIL import Image
+
+STATIC_DIR = "static"
+ASSET_DIR = os.path.join(STATIC_DIR, "assets")
+STATIC_URL = "app/static"
+
+LOGO_WIDTHS = (480, 960, 1600, 2400)
+FALLBACK_WIDTH = 1600
+
+_sources = {}
+_lock = threading.Lock()
+
+
+# --- Content hash and pixel width of a source, recomputed only when its mtime or size changes ---
+def source_info(path):
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    info = _sources.get(key)
+    if info is None:
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:12]
+        with Image.open(path) as im:
+            info = _sources[key] = (digest, im.width)
+    return info
+
+
+def source_digest(path):
+    return source_info(path)[0]
+
+
+def variant_name(path, width, fmt):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return f"{stem}-{source_digest(path)}-{width}w.{fmt}"
+
+
+# --- One resize and palette quantisation per width, saved as both formats ---
+def _encode(path, width):
+    with Image.open(path) as im:
+        im = im.convert("RGBA")
+        if im.width > width:
+            im = im.resize((width, max(1, round(im.height * width / im.width))), Image.LANCZOS)
+    # Logo and icons are flat artwork: 256 colours with alpha is visually lossless and
+    # compresses far better than lossy WebP of the full-colour image
+    im = im.quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+    suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+    for fmt, options in (("webp", {"lossless": True, "method": 4}), ("png", {"optimize": True})):
+        destination = os.path.join(ASSET_DIR, variant_name(path, width, fmt))
+        im.save(destination + suffix, fmt.upper(), **options)
+        os.replace(destination + suffix, destination)
+
+
+# --- Path of a resized, compressed copy of path; built the first time it is asked for ---
+def variant(path, width, fmt="webp"):
+    destination = os.path.join(ASSET_DIR, variant_name(path, width, fmt))
+    if not os.path.exists(destination):
+        with _lock:
+            if not os.path.exists(destination):
+                os.makedirs(ASSET_DIR, exist_ok=True)
+                _encode(path, width)
+    return destination
+
+
+def variant_url(path, width, fmt="webp"):
+    return f"{STATIC_URL}/{os.path.relpath(variant(path, width, fmt), STATIC_DIR).replace(os.sep, '/')}"
+
+
+# --- url(path, width, fmt) maps a variant to where the page can fetch it (static/ by default) ---
+def srcset(path, widths, fmt="webp", url=variant_url):
+    source_width = source_info(path)[1]
+    # Never upscale: widths past the source collapse onto the source width
+    widths = sorted({min(width, source_width) for width in widths})
+    return ", ".join(f"{url(path, width, fmt)} {width}w" for width in widths)
+
+
+# --- <picture> that lets the browser pick a WebP (or palette PNG) sized to the viewport ---
+def responsive_image_html(path, alt="", widths=LOGO_WIDTHS, sizes="100vw", url=variant_url):
+    fallback = url(path, min(widths, key=lambda width: abs(width - FALLBACK_WIDTH)), "png")
+    return (
+        "<picture>"
+        f"<source type='image/webp' srcset='{srcset(path, widths, 'webp', url)}' sizes='{sizes}'>"
+        f"<img src='{fallback}' srcset='{srcset(path, widths, 'png', url)}' sizes='{sizes}' alt='{alt}' "
+        "style='width: 100%; height: auto;' decoding='async'>"
+        "</picture>"
+    )
+
+
+# --- Variant inlined as a data: URI, for pages served without static files ---
+_data_uris = {}
+
+
+def data_uri(path, width, fmt="webp"):
+    destination = variant(path, width, fmt)
+    uri = _data_uris.get(destination)
+    if uri is None:
+        with open(destination, "rb") as f:
+            uri = _data_uris[destination] = f"data:image/{fmt};base64,{base64.b64encode(f.read()).decode('ascii')}"
+    return uri
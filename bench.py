@@ -0,0 +1,180 @@
+# ============================== #
+#       RENDER PATH BENCHMARK   #
+# ============================== #
+
+# Times each stage of the render path outside Streamlit, on synthetic results
+# scaled up from data.csv, and prints per-stage timings and peak memory as
+# JSON so runs on different commits can be diffed.
+#
+#   python bench.py                          # 10x, 100x and 1000x
+#   python bench.py --scales 10 --repeat 5 --out bench.json
+#   python bench.py --leagues 8 --weeks 12 --teams 60
+
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import matplotlib
+matplotlib.use("Agg")
+
+import pandas as pd
+
+import figures
+import league_charts
+from icons import icon_store
+from league_data import LeagueTable, load_data, PAGE_COLUMNS
+from rollups import Rollups
+from storage import backend_for
+from synthetic_data import git_commit, synthesize
+
+BASE_DATA = "data.csv"
+DEFAULT_SCALES = [10, 100, 1000]
+
+# ============================== #
+#           MEASURING           #
+# ============================== #
+
+def measure(fn, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+
+    # Peak is taken on a separate run so tracing overhead never skews the timings
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, {
+        "repeat": repeat,
+        "min_s": min(timings),
+        "median_s": statistics.median(timings),
+        "mean_s": statistics.fmean(timings),
+        "peak_traced_bytes": peak,
+    }
+
+
+def run_dataset(label, df, workdir, repeat, charts):
+    results = []
+
+    def record(stage, fn, **extra):
+        value, stats = measure(fn, repeat)
+        results.append({"dataset": label, "rows": len(df), "stage": stage, **extra, **stats})
+        return value
+
+    # --- Data load: CSV parse vs Arrow read ---
+    paths = {fmt: os.path.join(workdir, f"{label}.{fmt}") for fmt in ("csv", "arrow")}
+    for fmt, path in paths.items():
+        backend_for(path).write(df, path)
+        record("load_data", lambda: load_data(path, columns=PAGE_COLUMNS), format=fmt,
+               file_bytes=os.path.getsize(path))
+
+    table = record("league_table", lambda: LeagueTable(load_data(paths["csv"], columns=PAGE_COLUMNS)))
+    record("rollups", lambda: Rollups(table))
+
+    # --- Icon decode: cold store, then warm hits ---
+    league_numbers = sorted(set(table.league_to_number.values()))
+    banner_paths = [league_charts.flag_path, league_charts.start_path, league_charts.whistle_path]
+
+    def load_icons():
+        for number in league_numbers:
+            league_charts.load_league_images(number)
+        return [league_charts.safe_load_image(path) for path in banner_paths]
+
+    def load_icons_cold():
+        icon_store.clear()
+        return load_icons()
+
+    record("load_league_images", load_icons_cold, cache="cold")
+    flag_img, start_img, whistle_img = record("load_league_images", load_icons, cache="warm")
+
+    # --- Figure build and rasterise, for the largest week's first few leagues ---
+    week = table.weeks[-1]
+    for league in table.leagues_in_week(week)[:charts]:
+        league_df = table.slice(week, league)
+        # Batched runs at both caps so it can be compared row-for-row with the artist path
+        for batched, max_bars in ((False, league_charts.MAX_BARS), (True, league_charts.MAX_BARS),
+                                  (True, league_charts.BATCHED_MAX_BARS)):
+            mode = "batched" if batched else "artists"
+            bars = min(len(league_df), max_bars)
+
+            def build():
+                return league_charts.plot_league_data(league_df, league, flag_img, start_img, whistle_img,
+                                                      table.league_to_number, batched=batched, max_bars=max_bars)
+
+            record("plot_league_data", lambda: figures.close_figure(build()), mode=mode, league=league, bars=bars)
+            # Closing clears a figure, so rasterise timings get one that stays open
+            fig = build()
+            try:
+                for fmt in ("png", "svg"):
+                    record("figure_to_bytes", lambda: figures.figure_to_bytes(fig, fmt), mode=mode, league=league,
+                           bars=bars, format=fmt)
+            finally:
+                figures.close_figure(fig)
+    return results
+
+# ============================== #
+#         COMMAND LINE          #
+# ============================== #
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the league chart render path.")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES,
+                        help="dataset sizes as multiples of data.csv (default: 10 100 1000)")
+    parser.add_argument("--leagues", type=int, default=4, help="leagues per dataset (default: 4)")
+    parser.add_argument("--weeks", type=int, default=4, help="weeks per dataset (default: 4)")
+    parser.add_argument("--teams", type=int, default=None,
+                        help="teams per league; overrides --scales with a single dataset")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage (default: 3)")
+    parser.add_argument("--charts", type=int, default=2, help="leagues rendered per dataset (default: 2)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    base_rows = len(load_data(BASE_DATA))
+    if args.teams is not None:
+        datasets = [(f"{args.leagues}x{args.teams}x{args.weeks}",
+                     synthesize(leagues=args.leagues, teams=args.teams, weeks=args.weeks, seed=args.seed))]
+    else:
+        datasets = [(f"{scale}x", synthesize(rows=base_rows * scale, leagues=args.leagues, weeks=args.weeks,
+                                             seed=args.seed)) for scale in args.scales]
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for label, df in datasets:
+            print(f"Benchmarking {label} ({len(df)} rows)", file=sys.stderr)
+            results += run_dataset(label, df, workdir, args.repeat, args.charts)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "matplotlib": matplotlib.__version__,
+            "machine": platform.machine(),
+            "base_rows": base_rows,
+            "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2, default=str)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
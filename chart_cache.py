@@ -0,0 +1,91 @@
+# ============================== #
+#      RENDERED CHART CACHE     #
+# ============================== #
+
+# Process-wide LRU of finished chart images, keyed by (week, league, rows
+# fingerprint). A hit returns the encoded bytes directly, so serving a chart
+# that has been seen before costs no Matplotlib work at all. Keys may start
+# with a namespace (e.g. a season id) so sources with their own data version
+# can share the cache without clearing each other's entries.
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+def frame_fingerprint(frame):
+    hashed = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+    digest = hashlib.blake2b(hashed.tobytes(), digest_size=16)
+    digest.update("\x1f".join(map(str, frame.columns)).encode())
+    return digest.hexdigest()
+
+
+class ChartCache:
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.data_version = None
+        self._namespace_versions = {}
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # --- Drop everything rendered from an older data.csv (or just one namespace's entries) ---
+    def set_data_version(self, version, namespace=None):
+        if namespace is not None:
+            with self._lock:
+                changed = self._namespace_versions.get(namespace, version) != version
+                self._namespace_versions[namespace] = version
+            if changed:
+                self.discard_namespace(namespace)
+            return
+        with self._lock:
+            if version != self.data_version:
+                self._entries.clear()
+                self._bytes = 0
+                self.data_version = version
+
+    def discard_namespace(self, namespace):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == namespace]:
+                self._bytes -= len(self._entries.pop(key))
+
+    def get(self, key):
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def put(self, key, payload):
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._entries[key] = payload
+            self._bytes += len(payload)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def nbytes(self):
+        return self._bytes
+
+
+chart_cache = ChartCache()
@@ -0,0 +1,24 @@
+# ============================== #
+#          CHART STYLE          #
+# ============================== #
+
+# Look shared by every chart backend (Matplotlib and the client-side spec).
+
+BACKGROUND = '#171717'
+MARKER_COLOR = '#eeeeee'
+NAME_COLOR = 'white'
+
+# --- Value label colours: green at or past the target, gold when close, red otherwise ---
+TARGET_PCT = 100
+CLOSE_PCT = 85
+TARGET_COLOR = '#80CFA9'
+CLOSE_COLOR = '#FFD700'
+BEHIND_COLOR = '#FF6B6B'
+
+
+def label_color(value):
+    return TARGET_COLOR if value >= TARGET_PCT else CLOSE_COLOR if value >= CLOSE_PCT else BEHIND_COLOR
+
+
+def label_text(value):
+    return "" if value == 0 else f"{value:.1f}%"
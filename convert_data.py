@@ -0,0 +1,38 @@
+# ============================== #
+#       DATA FORMAT CONVERTER   #
+# ============================== #
+
+# Converts league results between storage formats, e.g. the CSV into the
+# Arrow file the app can load without parsing text:
+#
+#   python convert_data.py data.csv data.arrow
+#   python convert_data.py data.csv archive.parquet
+
+import argparse
+import time
+
+from storage import RESULT_COLUMNS, backend_for
+
+
+def convert(source, destination):
+    df = backend_for(source).read(source)
+    missing = [column for column in RESULT_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"{source} is missing columns: {', '.join(missing)}")
+    backend_for(destination).write(df[RESULT_COLUMNS], destination)
+    return len(df)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert league results between CSV, Arrow/Feather and Parquet.")
+    parser.add_argument("source", help="input file (.csv, .arrow, .feather or .parquet)")
+    parser.add_argument("destination", help="output file; format is picked from the extension")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    rows = convert(args.source, args.destination)
+    print(f"Wrote {rows} rows to {args.destination} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+# ============================== #
+#        STATIC SITE EXPORT     #
+# ============================== #
+
+# Writes the league tables as a plain HTML site that any file server or CDN
+# can serve, with no Streamlit or Python behind it:
+#
+#   python export_site.py --data data.csv --out site
+#
+#   site/index.html              latest week
+#   site/week-<n>.html           one page per week: banners, logo, week links,
+#                                every league's chart and standings
+#   site/assets/<name>.<hash>.*  charts, logo variants and the stylesheet
+#
+# Asset names carry a hash of their contents, so they can be cached forever
+# (Cache-Control: public, max-age=31536000, immutable); only the HTML pages
+# need revalidating. Charts are PNGs re-packed losslessly, logo variants come
+# from assets.py, and every text file gets a precompressed .gz sibling for
+# servers that serve those directly. The site is built next to --out and
+# swapped in whole, so a server never sees a half-written export.
+
+import argparse
+import gzip
+import hashlib
+import html
+import io
+import os
+import shutil
+import time
+
+from PIL import Image
+
+import assets
+import page_html
+from league_data import load_table, week_labels
+from prerender import render_all
+
+DEFAULT_OUT_DIR = "site"
+DEFAULT_TITLE = "Lionheart 2025 HQ Hop"
+LOGO_PATH = "images/logo.png"
+COMPRESSED_SUFFIXES = (".html", ".css", ".svg", ".json")
+
+STYLESHEET = """
+html, body { background-color: #171717; color: white; font-family: 'Roboto Condensed', 'Noto Sans', sans-serif; margin: 0; }
+main { max-width: 1400px; margin: 0 auto; padding: 0 1rem 2rem; }
+h1 { text-align: center; }
+nav.weeks { display: flex; flex-wrap: wrap; justify-content: center; gap: 0.5rem; margin-bottom: 2rem; font-size: 1.125rem; }
+nav.weeks a { color: white; background-color: #3F1F5A; padding: 0.4rem 0.9rem; border-radius: 0.5rem; text-decoration: none; }
+nav.weeks a[aria-current] { background-color: #FF6B6B; font-weight: bold; }
+section.league { display: flex; flex-wrap: wrap; gap: 1.5rem; align-items: flex-start; margin-bottom: 2.5rem; }
+section.league .chart { flex: 3 1 600px; }
+section.league .chart img { width: 100%; height: auto; }
+table.standings { flex: 2 1 320px; border-collapse: collapse; font-size: 0.95rem; }
+table.standings th, table.standings td { padding: 0.3rem 0.6rem; border-bottom: 1px solid #333; text-align: right; }
+table.standings td:nth-child(3), table.standings th:nth-child(3) { text-align: left; }
+"""
+
+
+class SiteWriter:
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self.asset_dir = os.path.join(out_dir, "assets")
+        os.makedirs(self.asset_dir, exist_ok=True)
+        self.files = 0
+        self.bytes = 0
+
+    def _write(self, path, payload):
+        with open(path, "wb") as f:
+            f.write(payload)
+        self.files += 1
+        self.bytes += len(payload)
+        if path.endswith(COMPRESSED_SUFFIXES):
+            # mtime=0 keeps the .gz byte-identical across exports of the same content
+            with open(path + ".gz", "wb") as f:
+                f.write(gzip.compress(payload, compresslevel=9, mtime=0))
+
+    # --- Write payload under a content-hashed name; returns its URL relative to the pages ---
+    def asset(self, name, payload):
+        stem, ext = os.path.splitext(name)
+        filename = f"{stem}.{hashlib.sha256(payload).hexdigest()[:10]}{ext}"
+        path = os.path.join(self.asset_dir, filename)
+        if not os.path.exists(path):
+            self._write(path, payload)
+        return f"assets/{filename}"
+
+    def page(self, name, text):
+        self._write(os.path.join(self.out_dir, name), text.encode("utf-8"))
+
+
+# --- Lossless re-pack of a Matplotlib PNG (Agg writes at the default zlib level) ---
+def optimise_png(payload):
+    with Image.open(io.BytesIO(payload)) as im:
+        size = im.size
+        buffer = io.BytesIO()
+        im.save(buffer, "PNG", optimize=True)
+    packed = buffer.getvalue()
+    return (packed if len(packed) < len(payload) else payload), size
+
+
+def week_page_name(week):
+    return f"week-{week}.html"
+
+
+def standings_html(table, week, league):
+    movement = table.standings.movement_table(week, league)
+    return movement.to_html(
+        index=False, classes="standings", border=0, na_rep="",
+        formatters={"%": "{:.1f}%".format, "Δ pts": "{:+.1f}".format},
+    )
+
+
+def render_page(title, week, week_map, league_sections, logo_html, stylesheet_url):
+    links = []
+    for w, label in week_map.items():
+        current = " aria-current='page'" if w == week else ""
+        links.append(f"<a href='{week_page_name(w)}'{current}>{html.escape(label)}</a>")
+    nav = "".join(links)
+    return (
+        "<!DOCTYPE html>\n<html lang='en'>\n<head>\n<meta charset='utf-8'>\n"
+        "<meta name='viewport' content='width=device-width, initial-scale=1'>\n"
+        f"<title>{html.escape(title)} League Tables – {html.escape(week_map[week])}</title>\n"
+        f"<link rel='stylesheet' href='{stylesheet_url}'>\n</head>\n<body>\n<main>\n"
+        f"{page_html.CREDITS_HTML}\n{logo_html}\n{page_html.DONATE_HTML}\n"
+        f"<h1>League Tables – Week {week}</h1>\n"
+        f"<nav class='weeks'>{nav}</nav>\n"
+        + "\n".join(league_sections) +
+        f"\n{page_html.DONATE_HTML}\n{page_html.CREDITS_HTML}\n</main>\n</body>\n</html>\n"
+    )
+
+
+def export(data_path, out_dir, title=DEFAULT_TITLE, workers=None):
+    table, report = load_table(data_path)
+    report.log(data_path)
+    week_map = week_labels(table.weeks)
+
+    build_dir = f"{out_dir.rstrip(os.sep)}.tmp-{os.getpid()}"
+    shutil.rmtree(build_dir, ignore_errors=True)
+    site = SiteWriter(build_dir)
+
+    stylesheet_url = site.asset("site.css", STYLESHEET.encode("utf-8"))
+
+    # --- Logo: the same width variants the live page uses, under hashed names ---
+    logo_html = ""
+    if os.path.exists(LOGO_PATH):
+        def logo_url(path, width, fmt):
+            with open(assets.variant(path, width, fmt), "rb") as f:
+                return site.asset(os.path.basename(assets.variant_name(path, width, fmt)), f.read())
+        logo_html = assets.responsive_image_html(LOGO_PATH, alt="Lionheart Headquarter Hop", url=logo_url)
+
+    # --- Charts: plot_league_data via the prerender workers ---
+    charts = {}
+    for week, league, _, payload in render_all(data_path, table, "png", workers):
+        payload, size = optimise_png(payload)
+        number = table.league_to_number[league]
+        charts[(week, league)] = (site.asset(f"week{week}-league{number}.png", payload), size)
+
+    for week in table.weeks:
+        sections = []
+        # League order is the order they first appear in the data, as on the live page
+        for i, league in enumerate(table.leagues_in_week(week)):
+            url, (width, height) = charts[(week, league)]
+            loading = "eager" if i == 0 else "lazy"
+            sections.append(
+                f"<h2>{html.escape(league)}</h2>\n<section class='league'>\n"
+                f"<div class='chart'><img src='{url}' width='{width}' height='{height}' "
+                f"alt='{html.escape(league)} – {html.escape(week_map[week])}' loading='{loading}' decoding='async'></div>\n"
+                f"{standings_html(table, week, league)}\n</section>"
+            )
+        page = render_page(title, week, week_map, sections, logo_html, stylesheet_url)
+        site.page(week_page_name(week), page)
+        if week == table.weeks[-1]:
+            site.page("index.html", page)
+
+    # Swap the finished export in whole
+    old_dir = f"{out_dir.rstrip(os.sep)}.old-{os.getpid()}"
+    if os.path.exists(out_dir):
+        os.replace(out_dir, old_dir)
+    os.replace(build_dir, out_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return site
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the league tables as a static HTML site.")
+    parser.add_argument("--data", default="data.csv", help="results file (default: data.csv)")
+    parser.add_argument("--out", default=DEFAULT_OUT_DIR, help=f"output directory (default: {DEFAULT_OUT_DIR})")
+    parser.add_argument("--title", default=DEFAULT_TITLE, help=f"event title (default: {DEFAULT_TITLE})")
+    parser.add_argument("--workers", type=int, default=None, help="render processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    site = export(args.data, args.out, title=args.title, workers=args.workers)
+    print(f"Wrote {site.files} files ({site.bytes / 1e6:.1f} MB) to {args.out} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
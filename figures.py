@@ -0,0 +1,275 @@
+# ============================== #
+#        FIGURE LIFECYCLE       #
+# ============================== #
+
+# Every chart figure is made and closed here instead of through pyplot.
+#
+# - No global registry. Figures are plain matplotlib Figure objects on an
+#   Agg canvas, not in pyplot's figure manager. A figure nobody closes is
+#   garbage collected like any other object; that is counted as a leak and
+#   logged.
+# - Bounded. At most MAX_LIVE_FIGURES figures (with their icon artists and
+#   resampled sprites) exist in a process at once. Further callers wait for
+#   one to close.
+# - Pooled buffers. The RGBA canvas Agg draws into is the largest allocation
+#   in a render (several MB for a full league at display size). Closing a figure
+#   returns it to a size-capped pool, so the next chart of the same size
+#   reuses it and does not leave a fresh one to the allocator.
+#
+# stats() exposes live figures, image bytes and pool size. A warning is
+# logged when those, or the process's peak RSS, keep growing window after
+# window.
+
+import io
+import logging
+import resource
+import threading
+import weakref
+from collections import OrderedDict
+
+from matplotlib import rcParams
+from matplotlib.backends.backend_agg import FigureCanvasAgg, RendererAgg
+from matplotlib.figure import Figure
+from matplotlib.offsetbox import OffsetImage
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# --- Same savefig options st.pyplot applies ---
+SAVEFIG_OPTIONS = {"bbox_inches": "tight", "dpi": 200}
+
+# --- Widest image st.image sends as-is; anything wider it resizes and re-encodes on every run ---
+MAX_DISPLAY_WIDTH = 1460
+RASTER_FORMATS = ("png", "jpg", "jpeg", "webp")
+
+MAX_LIVE_FIGURES = 8
+SLOT_TIMEOUT = 30
+RENDERER_POOL_BYTES = 128 * 1024 * 1024
+
+# --- Growth check: one sample every CHECK_EVERY closes, warn after GROWTH_WINDOWS rising samples ---
+CHECK_EVERY = 50
+GROWTH_WINDOWS = 5
+
+# ============================== #
+#         RENDERER POOL         #
+# ============================== #
+
+class RendererPool:
+    def __init__(self, max_bytes=RENDERER_POOL_BYTES):
+        self.max_bytes = max_bytes
+        self._renderers = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _size(key):
+        width, height, _ = key
+        return width * height * 4
+
+    # --- Renderer for (width, height, dpi), pooled or new ---
+    def take(self, key):
+        with self._lock:
+            free = self._renderers.get(key)
+            if free:
+                renderer = free.pop()
+                if not free:
+                    del self._renderers[key]
+                self._bytes -= self._size(key)
+                self.hits += 1
+                return renderer
+            self.misses += 1
+        return RendererAgg(*key)
+
+    def put(self, key, renderer):
+        size = self._size(key)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._renderers.setdefault(key, []).append(renderer)
+            self._renderers.move_to_end(key)
+            self._bytes += size
+            # Least recently returned sizes go first
+            while self._bytes > self.max_bytes:
+                stale_key, free = next(iter(self._renderers.items()))
+                free.pop(0)
+                if not free:
+                    del self._renderers[stale_key]
+                self._bytes -= self._size(stale_key)
+
+    def nbytes(self):
+        return self._bytes
+
+    def clear(self):
+        with self._lock:
+            self._renderers.clear()
+            self._bytes = 0
+
+
+renderer_pool = RendererPool()
+
+
+class PooledCanvas(FigureCanvasAgg):
+    # --- As FigureCanvasAgg, but renderers come from and go back to the pool ---
+    def get_renderer(self):
+        width, height = self.get_width_height(physical=True)
+        key = width, height, self.figure.dpi
+        if self._lastKey != key:
+            # bbox_inches="tight" draws once at full size, then again cropped
+            self.release()
+            self.renderer = renderer_pool.take(key)
+            self._lastKey = key
+        return self.renderer
+
+    def release(self):
+        renderer = getattr(self, "renderer", None)
+        if renderer is not None:
+            renderer_pool.put(self._lastKey, renderer)
+        self.renderer = None
+        self._lastKey = None
+
+# ============================== #
+#         FIGURE TRACKING       #
+# ============================== #
+
+class FigureTracker:
+    def __init__(self, max_live=MAX_LIVE_FIGURES, check_every=CHECK_EVERY, growth_windows=GROWTH_WINDOWS):
+        self.max_live = max_live
+        self.check_every = check_every
+        self.growth_windows = growth_windows
+        self._slots = threading.BoundedSemaphore(max_live)
+        self._live = weakref.WeakSet()
+        self._finalizers = weakref.WeakKeyDictionary()
+        self._samples = []
+        self._lock = threading.Lock()
+        self.created = 0
+        self.closed = 0
+        self.leaked = 0
+        self.slot_timeouts = 0
+
+    # --- New Figure on a pooled Agg canvas; waits while max_live figures are open ---
+    def new(self, **kwargs):
+        acquired = self._slots.acquire(timeout=SLOT_TIMEOUT)
+        if not acquired:
+            # Better an over-limit figure than a hung page; the growth check will flag the cause
+            self.slot_timeouts += 1
+            logger.warning("No figure slot free after %ss (%d live); figures are probably not being closed",
+                           SLOT_TIMEOUT, len(self._live))
+        fig = Figure(**kwargs)
+        PooledCanvas(fig)
+        with self._lock:
+            self._live.add(fig)
+            self._finalizers[fig] = weakref.finalize(fig, self._collected, acquired)
+            self.created += 1
+        return fig
+
+    def close(self, fig):
+        with self._lock:
+            finalizer = self._finalizers.pop(fig, None)
+            self._live.discard(fig)
+        if finalizer is None:
+            return
+        acquired = finalizer.detach()[2][0]
+        fig.canvas.release()
+        # Drops the axes and every artist holding sprites or text paths
+        fig.clear()
+        if acquired:
+            self._slots.release()
+        with self._lock:
+            self.closed += 1
+            check = self.closed % self.check_every == 0
+        if check:
+            self._check()
+
+    # --- Figure garbage collected without close(): free its slot and count the leak ---
+    def _collected(self, acquired):
+        self.leaked += 1
+        if acquired:
+            self._slots.release()
+        if self.leaked == 1 or self.leaked % 100 == 0:
+            logger.warning("%d figure(s) were garbage collected without being closed", self.leaked)
+
+    # --- Bytes of image data held by live figures (each array counted once) ---
+    def image_bytes(self):
+        arrays = {}
+        for fig in list(self._live):
+            for image in fig.findobj(OffsetImage):
+                data = image.get_data()
+                arrays[id(data)] = getattr(data, "nbytes", 0)
+            for artist in fig.findobj(lambda artist: hasattr(artist, "_scaled")):
+                for sprite in artist._scaled.values():
+                    arrays[id(sprite)] = sprite.nbytes
+        return sum(arrays.values())
+
+    def stats(self):
+        return {
+            "live_figures": len(self._live),
+            "created": self.created,
+            "closed": self.closed,
+            "leaked": self.leaked,
+            "slot_timeouts": self.slot_timeouts,
+            "image_bytes": self.image_bytes(),
+            "renderer_pool_bytes": renderer_pool.nbytes(),
+            "renderer_pool_hits": renderer_pool.hits,
+            "renderer_pool_misses": renderer_pool.misses,
+            "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        }
+
+    def _check(self):
+        stats = self.stats()
+        sample = (stats["live_figures"], stats["image_bytes"], stats["max_rss_kb"])
+        with self._lock:
+            self._samples = (self._samples + [sample])[-(self.growth_windows + 1):]
+            samples = self._samples
+        if len(samples) <= self.growth_windows:
+            return
+        for i, name in enumerate(("live figures", "figure image bytes", "peak RSS (KB)")):
+            values = [s[i] for s in samples]
+            if all(b > a for a, b in zip(values, values[1:])):
+                logger.warning("%s grew for %d checks in a row (%s); %s", name, self.growth_windows,
+                               " → ".join(map(str, values)), stats)
+                with self._lock:
+                    self._samples = []
+                return
+
+
+figure_tracker = FigureTracker()
+
+
+def new_figure(**kwargs):
+    return figure_tracker.new(**kwargs)
+
+
+def close_figure(fig):
+    figure_tracker.close(fig)
+
+
+def stats():
+    return figure_tracker.stats()
+
+
+# --- Highest dpi, up to SAVEFIG_OPTIONS', at which the tight-cropped figure fits max_width pixels ---
+def display_dpi(fig, max_width=MAX_DISPLAY_WIDTH):
+    bbox = fig.get_tightbbox(fig.canvas.get_renderer())
+    width = bbox.width + 2 * rcParams["savefig.pad_inches"]
+    return min(SAVEFIG_OPTIONS["dpi"], int(max_width / width))
+
+
+# --- Encoded figure, rasters sized to display as they are (cached and baked charts are served untouched) ---
+def figure_to_bytes(fig, fmt="png"):
+    buffer = io.BytesIO()
+    if fmt not in RASTER_FORMATS:
+        fig.savefig(buffer, format=fmt, **SAVEFIG_OPTIONS)
+        return buffer.getvalue()
+
+    fig.savefig(buffer, format=fmt, **{**SAVEFIG_OPTIONS, "dpi": display_dpi(fig)})
+    image = Image.open(buffer)
+    if image.width <= MAX_DISPLAY_WIDTH:
+        return buffer.getvalue()
+    # Text extents can round a pixel or two past the estimate: shrink once here instead
+    height = round(image.height * MAX_DISPLAY_WIDTH / image.width)
+    resized = image.resize((MAX_DISPLAY_WIDTH, height), Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    resized.save(buffer, format=image.format)
+    return buffer.getvalue()
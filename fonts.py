@@ -0,0 +1,115 @@
+# ============================== #
+#          CHART FONT           #
+# ============================== #
+
+# The charts draw with NotoSans, shipped as a 2 MB variable TTF. Matplotlib
+# only ever renders its default instance, so a static copy of that instance,
+# cut down to the Latin and punctuation glyphs the charts use, draws the same
+# text from a ~35 KB file. The copy is cached under .cache/fonts/, named after
+# a hash of the source, and made the first time a process finds it missing
+# (in the background, so that process keeps using the full font meanwhile).
+# Bake it into an image ahead of time, along with Matplotlib's font list:
+#
+#   python fonts.py
+
+import hashlib
+import os
+import threading
+
+FONT_SOURCE = "NotoSans-VariableFont_wdth,wght.ttf"
+FONT_CACHE_DIR = os.path.join(".cache", "fonts")
+
+# --- Printable ASCII, Latin-1, Latin Extended-A, general punctuation and the euro sign ---
+CHART_UNICODES = frozenset(
+    list(range(0x20, 0x7F)) + list(range(0xA0, 0x180)) + list(range(0x2010, 0x205F)) + [0x20AC]
+)
+
+_digests = {}
+_build_lock = threading.Lock()
+_building = set()
+
+
+def _source_digest(source):
+    stat = os.stat(source)
+    key = (os.path.abspath(source), stat.st_mtime_ns, stat.st_size)
+    digest = _digests.get(key)
+    if digest is None:
+        with open(source, "rb") as f:
+            digest = _digests[key] = hashlib.sha256(f.read()).hexdigest()[:12]
+    return digest
+
+
+def static_font_path(source=FONT_SOURCE, cache_dir=FONT_CACHE_DIR):
+    stem = os.path.splitext(os.path.basename(source))[0].split("-")[0]
+    return os.path.join(cache_dir, f"{stem}-{_source_digest(source)}-regular-subset.ttf")
+
+
+# --- Default-instance, glyph-subset copy of a variable font ---
+def build_static_font(source=FONT_SOURCE, destination=None):
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+    from fontTools.varLib import instancer
+
+    destination = destination or static_font_path(source)
+    font = TTFont(source)
+    subsetter = subset.Subsetter(subset.Options())
+    subsetter.populate(unicodes=CHART_UNICODES)
+    subsetter.subset(font)
+    if "fvar" in font:
+        # Pin every axis at its default: exactly what Matplotlib draws from the variable file
+        font = instancer.instantiateVariableFont(font, {axis.axisTag: axis.defaultValue for axis in font["fvar"].axes})
+
+    os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+    tmp_path = f"{destination}.{os.getpid()}.tmp"
+    font.save(tmp_path)
+    os.replace(tmp_path, destination)
+    return destination
+
+
+def _build_in_background(source, destination):
+    with _build_lock:
+        if destination in _building:
+            return
+        _building.add(destination)
+
+    def build():
+        try:
+            build_static_font(source, destination)
+        except Exception:
+            # No fontTools, unreadable font, read-only disk: the full font keeps working
+            pass
+
+    threading.Thread(target=build, name="static-font-build", daemon=True).start()
+
+
+# --- Font file the charts should load: the cached static copy once it exists ---
+def chart_font_path(source=FONT_SOURCE, build=True):
+    try:
+        destination = static_font_path(source)
+    except OSError:
+        return source
+    if os.path.exists(destination):
+        return destination
+    if build:
+        _build_in_background(source, destination)
+    return source
+
+
+# --- Whether every character of text is in the static copy ---
+def covers(text):
+    return all(ord(char) in CHART_UNICODES for char in text)
+
+
+def main():
+    import time
+
+    start = time.perf_counter()
+    path = build_static_font()
+    # Building Matplotlib's font list here keeps it off the first chart render
+    from matplotlib import font_manager
+    font_manager.fontManager.addfont(path)
+    print(f"Wrote {path} ({os.path.getsize(path)} bytes) in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
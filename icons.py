@@ -0,0 +1,142 @@
+# ============================== #
+#          ICON STORE           #
+# ============================== #
+
+# Process-wide store of decoded PNG icons. Lives at module level so every
+# Streamlit session (and every rerun) in the same server process shares it.
+# Nothing here imports Matplotlib, so the page can find and check icons
+# without paying for the plotting stack.
+
+import hashlib
+import io
+import logging
+import os
+import threading
+
+import numpy as np
+from PIL import Image
+
+from shared_cache import shared_cache
+
+logger = logging.getLogger(__name__)
+
+# --- Chart draws icons at this zoom of the source PNG ---
+ICON_ZOOM = 0.05
+
+# --- Resolution st.pyplot rasterises at (Streamlit's savefig default) ---
+RENDER_DPI = 200
+
+# --- Zoom to draw a pre-downscaled sprite at its native pixel size ---
+SPRITE_ZOOM = 72 / RENDER_DPI
+
+
+def sprite_size(width, height, zoom=ICON_ZOOM, dpi=RENDER_DPI):
+    scale = zoom * dpi / 72
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def decode_sprite(path, zoom=ICON_ZOOM, dpi=RENDER_DPI):
+    with Image.open(path) as im:
+        im = im.convert("RGBA")
+        size = sprite_size(*im.size, zoom=zoom, dpi=dpi)
+        if size != im.size:
+            im = im.resize(size, Image.LANCZOS)
+        return np.asarray(im)
+
+
+# --- Decoded sprite from the shared cache, keyed by the PNG's bytes, or decoded and stored there ---
+def shared_sprite(path, zoom=ICON_ZOOM, dpi=RENDER_DPI):
+    if shared_cache is None:
+        return decode_sprite(path, zoom, dpi)
+    with open(path, "rb") as f:
+        data = f.read()
+    key = (hashlib.blake2b(data).hexdigest(), zoom, dpi)
+    return shared_cache.get_or_compute("icon", key, lambda: decode_sprite(io.BytesIO(data), zoom, dpi))
+
+
+class IconStore:
+    def __init__(self, zoom=ICON_ZOOM, dpi=RENDER_DPI):
+        self.zoom = zoom
+        self.dpi = dpi
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # --- Sprite for path, decoded at most once per (path, mtime) ---
+    def get(self, path):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            self.discard(path)
+            return None
+
+        key = os.path.abspath(path)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == mtime:
+            self.hits += 1
+            return entry[1]
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == mtime:
+                self.hits += 1
+                return entry[1]
+            try:
+                sprite = shared_sprite(path, self.zoom, self.dpi)
+            except (OSError, ValueError):
+                self._entries.pop(key, None)
+                return None
+            sprite.setflags(write=False)
+            # Replacing the entry drops the stale sprite for an older mtime
+            self._entries[key] = (mtime, sprite)
+            self.misses += 1
+            return sprite
+
+    def discard(self, path):
+        with self._lock:
+            self._entries.pop(os.path.abspath(path), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def nbytes(self):
+        return sum(sprite.nbytes for _, sprite in self._entries.values())
+
+
+icon_store = IconStore()
+
+# ============================== #
+#        ICON FILES             #
+# ============================== #
+
+# --- Runner icon sets live in <images_dir>/<league number>/; each season can bring its own ---
+IMAGES_DIR = "images"
+
+# --- Shared banner icons ---
+flag_path = "images/checkered_flag.png"
+start_path = "images/start_icon.png"
+whistle_path = "images/whistle.png"
+
+# --- Safe image loader with warning (decoded once via the shared icon store) ---
+def safe_load_image(path, warn=logger.warning):
+    img = icon_store.get(path)
+    if img is None:
+        warn(f"Missing image: {path}")
+    return img
+
+# --- League-specific runner icon files, in the order rows cycle through them ---
+def league_image_paths(league_number, images_dir=IMAGES_DIR):
+    folder_path = os.path.join(images_dir, str(league_number))
+    if not os.path.exists(folder_path):
+        return []
+    return [os.path.join(folder_path, f) for f in sorted(os.listdir(folder_path)) if f.endswith(".png")]
+
+# --- Load league-specific runner icons ---
+def load_league_images(league_number, images_dir=IMAGES_DIR):
+    images = [safe_load_image(path) for path in league_image_paths(league_number, images_dir)]
+    return [img for img in images if img is not None]
@@ -0,0 +1,195 @@
+# ============================== #
+#       INCREMENTAL INGESTION   #
+# ============================== #
+
+# Watches data.csv (and an optional drop directory of per-week CSVs) and
+# folds only the new rows into the current LeagueTable. Each change produces
+# a new immutable snapshot; readers keep whichever snapshot they already hold,
+# so a page run never sees a half-applied update. Binary sources (Arrow,
+# Parquet) are replaced whole by convert_data.py, so they reload on change.
+# Every load and append goes through validate.clean first; report holds
+# what it found across the current table's rows. An append that resubmits a
+# team's week, or spells an existing team differently, reloads instead, so
+# the table always matches what a full load of the same files gives.
+
+import hashlib
+import io
+import os
+import threading
+import time
+
+import pandas as pd
+
+from icons import IMAGES_DIR
+from league_data import LeagueTable, load_data
+from storage import CsvBackend, backend_for
+from team_search import normalise
+from validate import clean
+
+
+class DataIngestor:
+    def __init__(self, csv_path="data.csv", drop_dir="data.d", poll_interval=1.0, columns=None, images_dir=IMAGES_DIR):
+        self.csv_path = csv_path
+        self.drop_dir = drop_dir
+        self.poll_interval = poll_interval
+        self.columns = columns
+        self.images_dir = images_dir
+        self.report = None
+        self._incremental = isinstance(backend_for(csv_path), CsvBackend)
+        self._lock = threading.Lock()
+        self._last_poll = 0.0
+        self.table = None
+        # Bumped on full reloads only; appends keep it, since chart keys carry row fingerprints
+        self.base_version = 0
+        self.appends = 0
+        self._reload()
+
+    # ============================== #
+    #          SOURCE STATE         #
+    # ============================== #
+
+    def _read_csv_state(self):
+        stat = os.stat(self.csv_path)
+        with open(self.csv_path, "rb") as f:
+            data = f.read()
+        self._pending_stat = (stat.st_mtime_ns, stat.st_size)
+        # Polls only consume whole lines; a row still being written waits for the next poll
+        end = data.rfind(b"\n") + 1
+        header_end = data.find(b"\n") + 1 or len(data)
+        return data, end, header_end
+
+    def _drop_files(self):
+        if not self.drop_dir or not os.path.isdir(self.drop_dir):
+            return {}
+        files = {}
+        for name in sorted(os.listdir(self.drop_dir)):
+            if name.endswith(".csv"):
+                stat = os.stat(os.path.join(self.drop_dir, name))
+                files[name] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def _reload(self):
+        if self._incremental:
+            # The whole file, as prerender and export_site read it: a last row without a newline counts
+            data, _, header_end = self._read_csv_state()
+            frames = [load_data(io.BytesIO(data), columns=self.columns)]
+            self._csv_header = data[:header_end]
+            self._csv_prefix_hash = hashlib.blake2b(data).digest()
+            self._csv_offset = len(data)
+            self._csv_tail_open = not data.endswith(b"\n")
+        else:
+            stat = os.stat(self.csv_path)
+            self._pending_stat = (stat.st_mtime_ns, stat.st_size)
+            frames = [load_data(self.csv_path, columns=self.columns)]
+        drop_files = self._drop_files()
+        frames += [load_data(os.path.join(self.drop_dir, name), columns=self.columns) for name in drop_files]
+
+        rows, report = clean(pd.concat(frames, ignore_index=True), images_dir=self.images_dir)
+        report.log(self.csv_path)
+        self.table = LeagueTable(rows)
+        self.report = report
+        self._csv_stat = self._pending_stat
+        self._drop_state = drop_files
+        self.base_version += 1
+
+    # ============================== #
+    #            POLLING            #
+    # ============================== #
+
+    # --- Current snapshot, picking up changes at most once per poll_interval ---
+    def snapshot(self):
+        if time.monotonic() - self._last_poll >= self.poll_interval:
+            self.poll()
+        return self.table
+
+    def poll(self):
+        with self._lock:
+            self._last_poll = time.monotonic()
+            try:
+                self._poll_csv()
+                self._poll_drop_dir()
+            except FileNotFoundError:
+                # Source briefly missing mid-replace: keep serving the last snapshot
+                pass
+        return self.table
+
+    def _poll_csv(self):
+        stat = os.stat(self.csv_path)
+        if (stat.st_mtime_ns, stat.st_size) == self._csv_stat:
+            return
+        if not self._incremental:
+            self._reload()
+            return
+
+        # Already-consumed bytes must be unchanged for this to be an append
+        data, end, _ = self._read_csv_state()
+        if len(data) < self._csv_offset or hashlib.blake2b(data[:self._csv_offset]).digest() != self._csv_prefix_hash:
+            self._reload()
+            return
+        # A last row read without its newline was still being written if the file carries on mid-line
+        carries_on = data[self._csv_offset:self._csv_offset + 1] not in (b"", b"\n", b"\r")
+        if self._csv_tail_open and carries_on:
+            self._reload()
+            return
+        self._csv_stat = self._pending_stat
+        if end <= self._csv_offset:
+            return
+
+        new_rows = load_data(io.BytesIO(self._csv_header + data[self._csv_offset:end]), columns=self.columns)
+        self._csv_prefix_hash = hashlib.blake2b(data[:end]).digest()
+        self._csv_offset = end
+        self._csv_tail_open = False
+        self._append(new_rows)
+
+    def _poll_drop_dir(self):
+        drop_files = self._drop_files()
+        if drop_files == self._drop_state:
+            return
+        changed = [name for name, state in self._drop_state.items() if drop_files.get(name) != state]
+        if changed:
+            # An edited or removed week file can't be applied as an append
+            self._reload()
+            return
+        added = [name for name in drop_files if name not in self._drop_state]
+        self._drop_state = drop_files
+        self._append(pd.concat([load_data(os.path.join(self.drop_dir, name), columns=self.columns) for name in added],
+                               ignore_index=True))
+
+    # --- True when rows touch a team already in the table under another spelling or in the same week ---
+    def _overlaps(self, rows):
+        if rows.empty or not len(self.table):
+            return False
+        frame = self.table.frame
+        names = frame["Team Name"]
+        existing = pd.DataFrame({
+            "League": frame["League"].astype(object).to_numpy(),
+            "key": names.cat.categories.map(normalise).to_numpy()[names.cat.codes.to_numpy()],
+            "name": names.astype(object).to_numpy(),
+            "Week": frame["Week"].to_numpy(),
+        })
+        added = pd.DataFrame({
+            "League": rows["League"].astype(object).to_numpy(),
+            "key": rows["Team Name"].map(normalise).to_numpy(),
+            "name": rows["Team Name"].astype(object).to_numpy(),
+            "Week": rows["Week"].to_numpy(),
+        })
+        same_team = added.merge(existing.drop_duplicates(["League", "key", "name"]).drop(columns="Week"),
+                                on=["League", "key"], suffixes=("", "_existing"))
+        if (same_team["name"] != same_team["name_existing"]).any():
+            return True
+        return not added.merge(existing[["League", "key", "Week"]], on=["League", "key", "Week"]).empty
+
+    def _append(self, rows):
+        if rows.empty:
+            return
+        rows, report = clean(rows, images_dir=self.images_dir)
+        if self._overlaps(rows):
+            # A corrected row or a new spelling: cleaning the whole file is what decides which row stays
+            self._reload()
+            return
+        report.log(self.csv_path)
+        self.report.extend(report)
+        if rows.empty:
+            return
+        self.table = self.table.extend(rows)
+        self.appends += 1
@@ -0,0 +1,86 @@
+# ============================== #
+#      LOCAL KEY-VALUE SERVER   #
+# ============================== #
+
+# A small key-value server that stands in for Redis while developing or on
+# a single host, so several app replicas can share one cache:
+#
+#   python kv_server.py --port 6380 --max-mb 256
+#   LIONHEART_CACHE=kv://127.0.0.1:6380 streamlit run app.py
+#
+# It keeps everything in one MemoryBackend (LRU, TTLs, size cap) and speaks
+# multiprocessing.connection, which unpickles what it receives: anyone who can
+# connect can run code on the server and, through the cache, on every replica.
+# So connections must authenticate with LIONHEART_CACHE_AUTHKEY, which has no
+# default. Without it the server listens on loopback only, under a random key
+# it prints for the replicas on this host. In production, point
+# LIONHEART_CACHE at redis:// instead; nothing else changes.
+
+import argparse
+import ipaddress
+import secrets
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener
+
+from shared_cache import MemoryBackend, authkey_from_env
+
+DEFAULT_PORT = 6380
+OPERATIONS = ("get", "set", "add", "delete", "delete_if", "clear")
+
+
+def serve_connection(connection, backend):
+    with connection:
+        while True:
+            try:
+                operation, *args = connection.recv()
+            except (EOFError, OSError):
+                return
+            if operation not in OPERATIONS:
+                connection.send(None)
+                continue
+            connection.send(getattr(backend, operation)(*args))
+
+
+def is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def serve(host="127.0.0.1", port=DEFAULT_PORT, max_bytes=256 * 1024 * 1024, authkey=None):
+    authkey = authkey if authkey is not None else authkey_from_env()
+    if not authkey:
+        if not is_loopback(host):
+            raise SystemExit(f"Refusing to listen on {host} without LIONHEART_CACHE_AUTHKEY set")
+        authkey = secrets.token_hex(16).encode()
+        print(f"LIONHEART_CACHE_AUTHKEY is unset; replicas on this host need LIONHEART_CACHE_AUTHKEY={authkey.decode()}")
+    backend = MemoryBackend(max_bytes=max_bytes, max_entries=1_000_000)
+    with Listener((host, port), authkey=authkey) as listener:
+        print(f"Serving the shared cache on {host}:{port}")
+        while True:
+            try:
+                connection = listener.accept()
+            except (AuthenticationError, OSError, EOFError):
+                # Failed handshake (wrong authkey, port scanner): keep serving everyone else
+                continue
+            threading.Thread(target=serve_connection, args=(connection, backend), daemon=True).start()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for the shared cache's Redis server.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default: {DEFAULT_PORT})")
+    parser.add_argument("--max-mb", type=int, default=256, help="memory cap in MB (default: 256)")
+    args = parser.parse_args(argv)
+    try:
+        serve(args.host, args.port, args.max_mb * 1024 * 1024)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
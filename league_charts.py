@@ -0,0 +1,260 @@
+# ============================== #
+#        LEAGUE CHARTS          #
+# ============================== #
+
+# Plotting code shared by the Streamlit page and the offline tools. Importing
+# this module has no Streamlit side effects, but it does pull in Matplotlib,
+# so the page leaves it to whichever process actually draws (see
+# render_pool.py) and reaches icons through icons.py. Figures come from
+# figures.py and must be closed with figures.close_figure.
+
+import matplotlib as mpl
+import numpy as np
+from matplotlib import font_manager
+from matplotlib.artist import Artist
+from matplotlib.collections import PathCollection
+from matplotlib.offsetbox import OffsetImage, AnnotationBbox
+from matplotlib.textpath import TextPath
+from matplotlib.transforms import Affine2D, Bbox, IdentityTransform
+from PIL import Image
+
+import fonts
+from chart_style import BACKGROUND, MARKER_COLOR, NAME_COLOR, TARGET_PCT, label_color, label_text
+from figures import new_figure
+from icons import (IMAGES_DIR, SPRITE_ZOOM, RENDER_DPI, flag_path, start_path, whistle_path,
+                   league_image_paths, load_league_images, safe_load_image)
+
+# --- Register the chart font once per process and make it the global default ---
+# The cached static subset when it exists; the full variable font draws anything it lacks
+font_path = fonts.chart_font_path()
+full_font_prop = font_manager.FontProperties(fname=fonts.FONT_SOURCE)
+font_prop = font_manager.FontProperties(fname=font_path)
+font_manager.fontManager.addfont(font_path)
+mpl.rcParams['font.family'] = font_prop.get_name()
+
+
+def font_for(text):
+    return font_prop if font_path == fonts.FONT_SOURCE or fonts.covers(text) else full_font_prop
+
+# --- Row caps: per-artist drawing vs the batched layers below ---
+MAX_BARS = 20
+BATCHED_MAX_BARS = 100
+
+# ============================== #
+#     BATCHED DRAWING LAYERS    #
+# ============================== #
+
+# One artist blits every icon sprite and one artist fills every label as a
+# single path collection, so draw cost stays roughly flat as rows grow.
+
+class SpriteLayer(Artist):
+    def __init__(self, ax):
+        super().__init__()
+        self.ax = ax
+        self.set_transform(ax.transData)
+        # Icons and labels spill past the axes, like the AnnotationBbox/text artists they replace
+        self.set_clip_on(False)
+        self._sprites = []
+        self._scaled = {}
+
+    # --- Queue a sprite anchored at data (x, y), aligned like AnnotationBbox.box_alignment ---
+    def add(self, img, xy, box_alignment=(0.5, 0.5)):
+        self._sprites.append((img, xy, box_alignment))
+
+    def clear(self):
+        self._sprites = []
+        self.stale = True
+
+    def _scaled_sprite(self, img, dpi):
+        if dpi == RENDER_DPI:
+            return img
+        key = (id(img), dpi)
+        scaled = self._scaled.get(key)
+        if scaled is None:
+            h, w = img.shape[:2]
+            size = (max(1, round(w * dpi / RENDER_DPI)), max(1, round(h * dpi / RENDER_DPI)))
+            scaled = np.asarray(Image.fromarray(img).resize(size, Image.LANCZOS))
+            self._scaled[key] = scaled
+        return scaled
+
+    def _placements(self, renderer):
+        dpi = renderer.points_to_pixels(72.0)
+        points = self.get_transform().transform([xy for _, xy, _ in self._sprites]) if self._sprites else []
+        for (img, _, (ax_, ay_)), (px, py) in zip(self._sprites, points):
+            sprite = self._scaled_sprite(img, dpi)
+            h, w = sprite.shape[:2]
+            yield sprite, round(px - ax_ * w), round(py - ay_ * h)
+
+    def draw(self, renderer):
+        if not self.get_visible() or not self._sprites:
+            return
+        gc = renderer.new_gc()
+        gc.set_clip_rectangle(None)
+        for sprite, x, y in self._placements(renderer):
+            # Agg puts array row 0 at the bottom, so flip to keep icons upright
+            renderer.draw_image(gc, x, y, sprite[::-1])
+        gc.restore()
+        self.stale = False
+
+    def get_window_extent(self, renderer=None):
+        if renderer is None:
+            renderer = self.figure._get_renderer()
+        boxes = [Bbox.from_bounds(x, y, s.shape[1], s.shape[0]) for s, x, y in self._placements(renderer)]
+        return Bbox.union(boxes) if boxes else Bbox.null()
+
+
+class LabelLayer(Artist):
+    _path_cache = {}
+
+    def __init__(self, ax):
+        super().__init__()
+        self.ax = ax
+        self.set_transform(ax.transData)
+        self.set_clip_on(False)
+        self._labels = []
+
+    # --- Glyph outlines in points plus their bounds, built once per (text, size, weight) per process ---
+    @classmethod
+    def _text_path(cls, text, size, weight):
+        key = (text, size, weight)
+        cached = cls._path_cache.get(key)
+        if cached is None:
+            prop = font_for(text).copy()
+            prop.set_weight(weight)
+            path = TextPath((0, 0), text, size=size, prop=prop)
+            # Control-point bounds: slightly loose, but far cheaper than Path.get_extents
+            extents = Bbox([path.vertices.min(axis=0), path.vertices.max(axis=0)]) if len(path.vertices) else Bbox.null()
+            if len(cls._path_cache) > 4096:
+                cls._path_cache.clear()
+            cached = cls._path_cache[key] = (path, extents)
+        return cached
+
+    # --- Queue a label anchored at data (x, y), vertically centred like va='center' ---
+    def add(self, x, y, text, size, color, ha="left", weight="normal"):
+        if not text:
+            return
+        path, extents = self._text_path(text, size, weight)
+        _, line = self._text_path("lp", size, weight)
+        dx = -extents.x1 if ha == "right" else 0.0
+        dy = -(line.y0 + line.y1) / 2
+        self._labels.append((path, extents, (x, y), (dx, dy), color))
+
+    def clear(self):
+        self._labels = []
+        self.stale = True
+
+    def _offsets(self, renderer):
+        scale = renderer.points_to_pixels(1.0)
+        anchors = self.get_transform().transform([xy for _, _, xy, _, _ in self._labels])
+        shifts = np.array([shift for _, _, _, shift, _ in self._labels]) * scale
+        return anchors + shifts, scale
+
+    def draw(self, renderer):
+        if not self.get_visible() or not self._labels:
+            return
+        offsets, scale = self._offsets(renderer)
+        collection = PathCollection(
+            [path for path, _, _, _, _ in self._labels],
+            offsets=offsets, offset_transform=IdentityTransform(),
+            facecolors=[color for _, _, _, _, color in self._labels],
+            edgecolors="none", linewidths=0, antialiaseds=True,
+        )
+        collection.set_transform(Affine2D().scale(scale))
+        collection.set_figure(self.figure)
+        collection.draw(renderer)
+        self.stale = False
+
+    def get_window_extent(self, renderer=None):
+        if renderer is None:
+            renderer = self.figure._get_renderer()
+        if not self._labels:
+            return Bbox.null()
+        offsets, scale = self._offsets(renderer)
+        boxes = []
+        for (_, e, _, _, _), (ox, oy) in zip(self._labels, offsets):
+            boxes.append(Bbox([[ox + e.x0 * scale, oy + e.y0 * scale], [ox + e.x1 * scale, oy + e.y1 * scale]]))
+        return Bbox.union(boxes)
+
+# ============================== #
+#       PLOTTING FUNCTION        #
+# ============================== #
+
+def plot_league_data(league_df, league_name, flag_img, start_img, whistle_img, league_to_number,
+                     batched=False, max_bars=None, images_dir=IMAGES_DIR):
+    # Slices from LeagueTable arrive pre-sorted, so skip the sort (and its copy) for them
+    if league_df["% Distance Covered"].is_monotonic_increasing:
+        df_sorted = league_df.reset_index(drop=True)
+    else:
+        df_sorted = league_df.sort_values(by="% Distance Covered").reset_index(drop=True)
+    league_number = league_to_number[league_name]
+    runner_images = load_league_images(league_number, images_dir)
+
+    if not runner_images or df_sorted.empty:
+        return new_figure()
+
+    if max_bars is None:
+        max_bars = BATCHED_MAX_BARS if batched else MAX_BARS
+    num_bars = min(len(df_sorted), max_bars)
+    values = df_sorted['% Distance Covered'][:num_bars]
+    names = df_sorted['Team Name'][:num_bars]
+
+    fig = new_figure(figsize=(14, 0.65 * num_bars))
+    ax = fig.subplots()
+    fig.patch.set_facecolor(BACKGROUND)
+    ax.set_facecolor(BACKGROUND)
+    ax.axis('off')
+
+    bar_height = 0.7
+    y_positions = range(num_bars)
+    if batched:
+        sprites = SpriteLayer(ax)
+        labels = LabelLayer(ax)
+    else:
+        ax.barh(y=y_positions, width=values, height=bar_height, color=(0, 0, 0, 0))
+
+    # --- Runner icons ---
+    for i, value in enumerate(values):
+        img = runner_images[i % len(runner_images)]
+        if img is None:
+            continue
+        if batched:
+            sprites.add(img, (value, i))
+        else:
+            icon = OffsetImage(img, zoom=SPRITE_ZOOM, resample=True)
+            ab = AnnotationBbox(icon, (value, i), frameon=False, box_alignment=(0.5, 0.5))
+            ax.add_artist(ab)
+
+    # --- Labels and values ---
+    for i, (value, name) in enumerate(zip(values, names)):
+        text = label_text(value)
+        color = label_color(value)
+        if batched:
+            labels.add(value - 2.5, i, name, 16, NAME_COLOR, ha='right', weight='bold')
+            labels.add(value + 4.5, i, text, 14, color)
+        else:
+            ax.text(x=value - 2.5, y=i, s=name, ha='right', va='center',
+                    fontsize=16, color=NAME_COLOR, weight='bold', fontproperties=font_for(name))
+            ax.text(x=value + 4.5, y=i, s=text, ha='left', va='center',
+                    fontsize=14, color=color, fontproperties=font_for(text))
+
+    max_value = values.max()
+    ax.set_xlim(0, max(110, max_value + 5))
+    ax.set_ylim(-1, y_positions[-1] + 1.2)
+
+    start_y = num_bars - 0.5 + 0.2
+    ax.axvline(x=0, color=MARKER_COLOR, linestyle='--', linewidth=0.75)
+    ax.axvline(x=TARGET_PCT, color=MARKER_COLOR, linestyle='--', linewidth=0.75)
+    if batched:
+        if whistle_img is not None:
+            sprites.add(whistle_img, (0, start_y), box_alignment=(0.5, 0))
+        if flag_img is not None:
+            sprites.add(flag_img, (102.5, start_y), box_alignment=(0.5, 0))
+        ax.add_artist(sprites)
+        ax.add_artist(labels)
+    else:
+        if whistle_img is not None:
+            ax.add_artist(AnnotationBbox(OffsetImage(whistle_img, zoom=SPRITE_ZOOM), (0, start_y), frameon=False, box_alignment=(0.5, 0)))
+        if flag_img is not None:
+            ax.add_artist(AnnotationBbox(OffsetImage(flag_img, zoom=SPRITE_ZOOM), (102.5, start_y), frameon=False, box_alignment=(0.5, 0)))
+
+    return fig
@@ -0,0 +1,195 @@
+# ============================== #
+#        LEAGUE DATA LAYER      #
+# ============================== #
+
+# Results table built once per data version: categorical text columns, rows
+# pre-sorted by (Week, League, % Distance Covered), and a (Week, League) index
+# of row ranges so a league's slice is an O(1), copy-free lookup.
+
+import copy
+import hashlib
+import io
+
+import numpy as np
+import pandas as pd
+
+from chart_cache import frame_fingerprint
+from icons import IMAGES_DIR
+from rollups import Rollups
+from shared_cache import shared_cache
+from standings import Standings
+from team_search import TeamIndex
+from validate import clean
+from storage import CsvBackend, backend_for
+
+CATEGORICAL_COLUMNS = ["League", "Team Name", "Category"]
+
+# --- Columns the page draws from (Category only feeds the rollup boards) ---
+PAGE_COLUMNS = ["League Number", "League", "Team Name", "% Distance Covered", "Category", "Week"]
+
+
+# --- Week number to the label the week pickers show ---
+def week_labels(weeks):
+    return {week: f"Week {week}" for week in weeks}
+
+
+# --- Read results through the storage backend matching the file type ---
+def load_data(path="data.csv", columns=None, weeks=None):
+    backend = backend_for(path)
+    if shared_cache is None or not isinstance(backend, CsvBackend):
+        # Arrow and Parquet reads are already cheaper than a cache round trip
+        return backend.read(path, columns=columns, weeks=weeks)
+
+    # --- Parsed CSVs are shared between replicas, keyed by content rather than path or mtime ---
+    if isinstance(path, io.BytesIO):
+        data = path.getvalue()
+    else:
+        with open(path, "rb") as f:
+            data = f.read()
+    key = (hashlib.blake2b(data).hexdigest(), columns if columns is None else tuple(columns), weeks if weeks is None else tuple(weeks))
+    return shared_cache.get_or_compute(
+        "csv", key, lambda: backend.read(io.BytesIO(data), columns=columns, weeks=weeks), ttl=3600)
+
+
+# --- Validated table for a results file, plus the validation report ---
+# clean() and LeagueTable copy and sort the rows, so an Arrow file only makes the read faster
+def load_table(path="data.csv", columns=PAGE_COLUMNS, images_dir=IMAGES_DIR):
+    rows, report = clean(load_data(path, columns=columns), images_dir=images_dir)
+    return LeagueTable(rows), report
+
+
+class LeagueTable:
+    def __init__(self, df):
+        df = df.copy()
+        for column in CATEGORICAL_COLUMNS:
+            if column in df.columns:
+                df[column] = df[column].astype("category")
+
+        # League order is first appearance in the file, as the page has always shown it
+        first_rows = df.drop_duplicates(subset=["League"])
+        self.leagues = list(first_rows["League"].astype(object))
+        self.league_to_number = dict(zip(self.leagues, first_rows["League Number"]))
+        self._league_rank = {league: i for i, league in enumerate(self.leagues)}
+        self._standings = None
+        self._team_index = None
+        self._rollups = None
+        self._set_frame(self._sorted(df), {})
+
+    def _league_codes(self, frame):
+        return frame["League"].astype(object).map(self._league_rank).to_numpy()
+
+    def _sorted(self, frame):
+        order = np.lexsort((frame["% Distance Covered"].to_numpy(), self._league_codes(frame), frame["Week"].to_numpy()))
+        return frame.iloc[order].reset_index(drop=True)
+
+    # --- Row ranges of each contiguous (Week, League) run ---
+    def _set_frame(self, frame, fingerprints):
+        self.frame = frame
+        self.weeks = sorted(int(week) for week in frame["Week"].unique())
+
+        weeks = frame["Week"].to_numpy()
+        codes = self._league_codes(frame)
+        breaks = np.flatnonzero((weeks[1:] != weeks[:-1]) | (codes[1:] != codes[:-1])) + 1
+        starts = np.concatenate(([0], breaks)) if len(frame) else np.array([], dtype=int)
+        stops = np.concatenate((breaks, [len(frame)])) if len(frame) else np.array([], dtype=int)
+
+        self._ranges = {}
+        self._week_leagues = {}
+        self._week_ranges = {}
+        for start, stop in zip(starts, stops):
+            week, league = int(weeks[start]), self.leagues[codes[start]]
+            self._ranges[(week, league)] = (int(start), int(stop))
+            self._week_leagues.setdefault(week, []).append(league)
+            week_start = self._week_ranges.get(week, (int(start), None))[0]
+            self._week_ranges[week] = (week_start, int(stop))
+        self._fingerprints = fingerprints
+
+    # --- New snapshot with rows appended; only the weeks they touch are re-sorted ---
+    def extend(self, rows):
+        if rows.empty:
+            return self
+        table = copy.copy(self)
+
+        table.leagues = list(self.leagues)
+        table.league_to_number = dict(self.league_to_number)
+        new_first_rows = rows.drop_duplicates(subset=["League"])
+        for league, number in zip(new_first_rows["League"].astype(object), new_first_rows["League Number"]):
+            if league not in table.league_to_number:
+                table.leagues.append(league)
+                table.league_to_number[league] = number
+        table._league_rank = {league: i for i, league in enumerate(table.leagues)}
+
+        # Append unseen categories so existing codes are kept as they are
+        old, rows = self.frame, rows.copy()
+        for column in CATEGORICAL_COLUMNS:
+            if column not in rows.columns:
+                continue
+            categories = old[column].cat.categories
+            missing = pd.Index(rows[column].astype(object).unique()).difference(categories)
+            if len(missing):
+                old = old.assign(**{column: old[column].cat.add_categories(missing)})
+            rows[column] = pd.Categorical(rows[column].astype(object), categories=old[column].cat.categories)
+
+        affected = set(int(week) for week in rows["Week"].unique())
+        blocks = []
+        for week in sorted(set(self.weeks) | affected):
+            start, stop = self._week_ranges.get(week, (0, 0))
+            block = old.iloc[start:stop]
+            if week in affected:
+                block = table._sorted(pd.concat([block, rows[rows["Week"] == week]], ignore_index=True))
+            blocks.append(block)
+
+        fingerprints = {key: value for key, value in self._fingerprints.items() if key[0] not in affected}
+        table._set_frame(pd.concat(blocks, ignore_index=True), fingerprints)
+        # Standings already built are carried forward, recomputing from the earliest new week
+        if self._standings is not None:
+            table._standings = self._standings.extend(table, affected)
+        table._team_index = None
+        table._rollups = None
+        return table
+
+    # --- Rows for one league in one week, sorted by % Distance Covered ---
+    def slice(self, week, league):
+        bounds = self._ranges.get((int(week), league))
+        if bounds is None:
+            return self.frame.iloc[0:0]
+        return self.frame.iloc[bounds[0]:bounds[1]]
+
+    def leagues_in_week(self, week):
+        return self._week_leagues.get(int(week), [])
+
+    def week_frame(self, week):
+        start, stop = self._week_ranges.get(int(week), (0, 0))
+        return self.frame.iloc[start:stop]
+
+    # --- Row-content hash per (week, league), computed once ---
+    def fingerprint(self, week, league):
+        key = (int(week), league)
+        fingerprint = self._fingerprints.get(key)
+        if fingerprint is None:
+            fingerprint = self._fingerprints[key] = frame_fingerprint(self.slice(week, league))
+        return fingerprint
+
+    # --- Rank, movement and trend for every week, built on first use ---
+    @property
+    def standings(self):
+        if self._standings is None:
+            self._standings = Standings(self)
+        return self._standings
+
+    # --- Team name search over this version of the rows, built on first use ---
+    @property
+    def team_index(self):
+        if self._team_index is None:
+            self._team_index = TeamIndex(self)
+        return self._team_index
+
+    # --- Category and League boards for every week, built on first use ---
+    @property
+    def rollups(self):
+        if self._rollups is None:
+            self._rollups = Rollups(self)
+        return self._rollups
+
+    def __len__(self):
+        return len(self.frame)
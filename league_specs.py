@@ -0,0 +1,128 @@
+# ============================== #
+#     CLIENT-SIDE CHART SPECS    #
+# ============================== #
+
+# Vega-Lite version of plot_league_data: the sorted rows and icon URLs go to
+# the browser as a few KB of JSON and the browser draws the chart, so a week
+# change costs no server-side rasterising and every team can be shown.
+#
+# Layout mirrors the Matplotlib chart: one row per team (lowest at the
+# bottom), runner icon at the team's %, name to the left, % to the right,
+# dashed lines at 0 and 100, whistle and flag above the start and finish.
+
+import json
+import os
+
+import icons
+from chart_style import BACKGROUND, MARKER_COLOR, NAME_COLOR, TARGET_PCT, label_color, label_text
+from icons import ICON_ZOOM, sprite_size
+
+VEGA_LITE_SCHEMA = "https://vega.github.io/schema/vega-lite/v5.json"
+
+# --- Browser sizes, from the Matplotlib figure's inches at CSS pixel density ---
+CSS_DPI = 96
+ROW_HEIGHT = round(0.65 * CSS_DPI)
+ICON_SIZE = sprite_size(662, 662, zoom=ICON_ZOOM, dpi=CSS_DPI)[0]
+# Icon files are fetched at twice their drawn size so they stay sharp on high-DPI screens
+ICON_FETCH_WIDTH = 2 * ICON_SIZE
+
+FONT = "Noto Sans, sans-serif"
+
+
+# --- Every layer plots on the same fixed data-unit axes as the Matplotlib chart ---
+def _position(x_field, y_field, x_scale, y_scale):
+    encoding = {"x": {"field": x_field, "type": "quantitative", "scale": x_scale, "axis": None}}
+    if y_field is not None:
+        encoding["y"] = {"field": y_field, "type": "quantitative", "scale": y_scale, "axis": None}
+    return encoding
+
+
+def _image_mark(baseline="middle"):
+    return {"type": "image", "width": ICON_SIZE, "height": ICON_SIZE, "align": "center", "baseline": baseline}
+
+
+# --- Vega-Lite spec for one league's week; icon_url(path) maps an icon file to a browser URL ---
+def league_chart_spec(league_df, league_name, league_to_number, icon_url, max_bars=None,
+                      images_dir=icons.IMAGES_DIR):
+    if league_df["% Distance Covered"].is_monotonic_increasing:
+        df_sorted = league_df.reset_index(drop=True)
+    else:
+        df_sorted = league_df.sort_values(by="% Distance Covered").reset_index(drop=True)
+    runner_paths = icons.league_image_paths(league_to_number[league_name], images_dir)
+    if not runner_paths or df_sorted.empty:
+        return None
+
+    num_bars = len(df_sorted) if max_bars is None else min(len(df_sorted), max_bars)
+    values = df_sorted["% Distance Covered"][:num_bars].tolist()
+    names = df_sorted["Team Name"][:num_bars].astype(str).tolist()
+
+    # URLs go in once as a parameter; rows carry only an index into it
+    icon_urls = [icon_url(path) for path in runner_paths]
+    rows = [{
+        "row": i,
+        "value": value,
+        "icon": i % len(icon_urls),
+        "name": name,
+        "name_x": value - 2.5,
+        "label": label_text(value),
+        "label_x": value + 4.5,
+        "color": label_color(value),
+    } for i, (value, name) in enumerate(zip(values, names))]
+
+    start_y = num_bars - 0.5 + 0.2
+    banners = [{"x": x, "y": start_y, "url": icon_url(path)}
+               for x, path in ((0, icons.whistle_path), (102.5, icons.flag_path))
+               if os.path.exists(path)]
+
+    x_scale = {"domain": [0, max(110, max(values) + 5)], "nice": False, "zero": False}
+    y_scale = {"domain": [-1, num_bars - 1 + 1.2], "nice": False, "zero": False}
+
+    return {
+        "$schema": VEGA_LITE_SCHEMA,
+        "width": "container",
+        "height": ROW_HEIGHT * num_bars,
+        "background": BACKGROUND,
+        "padding": {"left": 20, "right": 20, "top": ICON_SIZE, "bottom": 10},
+        "params": [{"name": "icons", "value": icon_urls}],
+        "config": {"view": {"stroke": None}, "font": FONT},
+        # Team rows are sent once and shared by the icon and label layers
+        "data": {"values": rows},
+        "layer": [
+            # --- Start and finish lines ---
+            {
+                "data": {"values": [{"x": 0}, {"x": TARGET_PCT}]},
+                "mark": {"type": "rule", "color": MARKER_COLOR, "strokeDash": [5, 3], "strokeWidth": 1},
+                "encoding": _position("x", None, x_scale, y_scale),
+            },
+            # --- Runner icons ---
+            {
+                "transform": [{"calculate": "icons[datum.icon]", "as": "url"}],
+                "mark": _image_mark(),
+                "encoding": {**_position("value", "row", x_scale, y_scale), "url": {"field": "url", "type": "nominal"}},
+            },
+            # --- Labels and values ---
+            {
+                "mark": {"type": "text", "align": "right", "baseline": "middle", "fontSize": 21,
+                         "fontWeight": "bold", "color": NAME_COLOR},
+                "encoding": {**_position("name_x", "row", x_scale, y_scale), "text": {"field": "name"}},
+            },
+            {
+                "mark": {"type": "text", "align": "left", "baseline": "middle", "fontSize": 19},
+                "encoding": {
+                    **_position("label_x", "row", x_scale, y_scale),
+                    "text": {"field": "label"},
+                    "color": {"field": "color", "type": "nominal", "scale": None},
+                },
+            },
+            # --- Whistle and flag above the start and finish ---
+            {
+                "data": {"values": banners},
+                "mark": _image_mark(baseline="bottom"),
+                "encoding": {**_position("x", "y", x_scale, y_scale), "url": {"field": "url", "type": "nominal"}},
+            },
+        ],
+    }
+
+
+def spec_to_bytes(spec):
+    return json.dumps(spec, separators=(",", ":")).encode()
@@ -0,0 +1,322 @@
+# ============================== #
+#          LOAD TEST            #
+# ============================== #
+
+# Simulates viewers hitting the app at once, to size a deployment for
+# results-day peaks and to catch changes that make each rerun heavier. Each
+# session is a Streamlit AppTest of app.py running in this process, so they
+# all share the server-side caches and render pool exactly as real sessions
+# on one server do (no browser or websocket in the loop). Sessions load the
+# page, then keep switching a random league to a random week through its
+# week_radio_<league> radio, pausing for a think time in between. In lazy
+# mode a league's radio only exists once its expander is open, so a session
+# first opens it (timed as an "open" rerun), as a viewer would.
+#
+# AppTest cannot rerun a single fragment: every open and week switch is run
+# as a full-script rerun. Real viewers in lazy mode get fragment-scoped
+# reruns, so these latencies are an upper bound on theirs; the report's
+# "rerun_scope" says so.
+#
+#   python loadtest.py --sessions 20 --duration 60
+#   python loadtest.py --sessions 50 --think lognormal:3,0.8 --ramp 10
+#   python loadtest.py --scale 100 --max-p95 500      # exits 1 if p95 > 500 ms
+#
+# Think times: const:S, uniform:A,B, exp:MEAN or lognormal:MEDIAN,SIGMA (seconds).
+# Prints p50/p95/p99 rerun latency, throughput, and RSS (this process plus
+# the render workers) sampled over the run, as JSON.
+
+import argparse
+import json
+import math
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from synthetic_data import git_commit, synthesize
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+RADIO_PREFIX = "week_radio_"
+EXPANDER_PREFIX = "league_open_"
+RERUN_SCOPE = "full script (AppTest approximates fragment-scoped reruns with full reruns)"
+
+# ============================== #
+#          THINK TIME           #
+# ============================== #
+
+# --- Seconds-sampling function for a think-time spec ---
+def think_time(spec):
+    name, _, params = spec.partition(":")
+    values = [float(value) for value in params.split(",") if value]
+    try:
+        if name == "const":
+            (seconds,) = values
+            return lambda rng: seconds
+        if name == "uniform":
+            low, high = values
+            return lambda rng: rng.uniform(low, high)
+        if name == "exp":
+            (mean,) = values
+            return lambda rng: rng.expovariate(1 / mean) if mean > 0 else 0.0
+        if name == "lognormal":
+            median, sigma = values
+            return lambda rng: rng.lognormvariate(math.log(median), sigma)
+    except ValueError:
+        pass
+    raise argparse.ArgumentTypeError(f"Bad think time {spec!r}: use const:S, uniform:A,B, exp:MEAN or lognormal:MEDIAN,SIGMA")
+
+# ============================== #
+#         MEMORY SAMPLES        #
+# ============================== #
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def process_rss(pid):
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def child_pids(pid):
+    children = []
+    try:
+        for task in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{task}/children") as f:
+                children += [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+    return children + [grandchild for child in children for grandchild in child_pids(child)]
+
+
+class RssSampler(threading.Thread):
+    def __init__(self, interval, start):
+        super().__init__(name="rss-sampler", daemon=True)
+        self.interval = interval
+        self.start_time = start
+        self.samples = []
+        self._done = threading.Event()
+
+    def sample(self):
+        pid = os.getpid()
+        children = child_pids(pid)
+        self.samples.append({
+            "t_s": round(time.monotonic() - self.start_time, 2),
+            "rss_mb": round(process_rss(pid) / 2**20, 1),
+            "workers_rss_mb": round(sum(process_rss(child) for child in children) / 2**20, 1),
+            "workers": len(children),
+        })
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            self.sample()
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        self.sample()
+
+# ============================== #
+#            SESSIONS           #
+# ============================== #
+
+class LoadTest:
+    def __init__(self, sessions, duration, think, ramp=0.0, timeout=120, seed=0):
+        self.sessions = sessions
+        self.duration = duration
+        self.think = think
+        self.ramp = ramp
+        self.timeout = timeout
+        self.seed = seed
+        self.reruns = []
+        self.errors = []
+        self._lock = threading.Lock()
+
+    def _timed(self, session, kind, rerun):
+        start = time.perf_counter()
+        error = None
+        try:
+            at = rerun()
+            if at.exception:
+                error = at.exception[0].message
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+        ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self.reruns.append({"t_s": time.monotonic() - self.start, "session": session, "kind": kind, "ms": ms,
+                                "ok": error is None})
+            if error is not None:
+                self.errors.append({"session": session, "kind": kind, "error": error})
+        return error is None
+
+    # --- League name to its week radio, for every league whose radio is on the page ---
+    @staticmethod
+    def _week_radios(at):
+        return {radio.key[len(RADIO_PREFIX):]: radio for radio in at.radio
+                if radio.key and radio.key.startswith(RADIO_PREFIX)}
+
+    # --- AppTest forgets expanders opened through session_state once a widget value is set: mark them again ---
+    @staticmethod
+    def _keep_open(at, opened, leagues):
+        for league in opened:
+            if league in leagues:
+                at.session_state[EXPANDER_PREFIX + league] = True
+
+    def _session(self, index):
+        from streamlit.testing.v1 import AppTest
+
+        rng = random.Random(self.seed * 1000 + index)
+        time.sleep(self.ramp * index / max(1, self.sessions))
+        at = AppTest.from_file(APP_PATH, default_timeout=self.timeout)
+        if not self._timed(index, "initial", at.run):
+            return
+        # Leagues this viewer has open, re-marked before every rerun (see _keep_open)
+        opened = set(self._week_radios(at))
+
+        while True:
+            pause = self.think(rng)
+            if time.monotonic() + pause >= self.deadline:
+                return
+            time.sleep(pause)
+            leagues = [expander.key[len(EXPANDER_PREFIX):] for expander in at.expander
+                       if expander.key and expander.key.startswith(EXPANDER_PREFIX)]
+            candidates = sorted(set(leagues) | set(self._week_radios(at)))
+            if not candidates:
+                with self._lock:
+                    self.errors.append({"session": index, "kind": "switch", "error": "no week radios on the page"})
+                return
+            league = rng.choice(candidates)
+            if league not in self._week_radios(at):
+                # Lazy mode: the league's radio appears once its expander is open
+                self._keep_open(at, opened | {league}, leagues)
+                if not self._timed(index, "open", at.run):
+                    continue
+                opened.add(league)
+                if league not in self._week_radios(at):
+                    # Opened on a week the league has no results for
+                    continue
+            radio = self._week_radios(at)[league]
+            weeks = [week for week in radio.options if week != radio.value] or list(radio.options)
+            radio.set_value(rng.choice(weeks))
+            self._keep_open(at, opened, leagues)
+            self._timed(index, "switch", at.run)
+
+    def run(self, sample_interval=1.0):
+        self.start = time.monotonic()
+        self.deadline = self.start + self.ramp + self.duration
+        sampler = RssSampler(sample_interval, self.start)
+        sampler.sample()
+        sampler.start()
+        threads = [threading.Thread(target=self._session, args=(i,), name=f"session-{i}") for i in range(self.sessions)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        sampler.stop()
+        self.elapsed = time.monotonic() - self.start
+        self.rss_samples = sampler.samples
+        return self.report()
+
+    def report(self):
+        summary = {}
+        for kind in ("initial", "open", "switch"):
+            timings = np.array([rerun["ms"] for rerun in self.reruns if rerun["kind"] == kind and rerun["ok"]])
+            if not len(timings):
+                continue
+            p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+            summary[kind] = {
+                "reruns": len(timings),
+                "p50_ms": round(p50, 1),
+                "p95_ms": round(p95, 1),
+                "p99_ms": round(p99, 1),
+                "mean_ms": round(float(timings.mean()), 1),
+                "max_ms": round(float(timings.max()), 1),
+            }
+        ok = sum(rerun["ok"] for rerun in self.reruns)
+        peak = max(self.rss_samples, key=lambda sample: sample["rss_mb"] + sample["workers_rss_mb"])
+        return {
+            "rerun_scope": RERUN_SCOPE,
+            "latency": summary,
+            "throughput_rps": round(ok / self.elapsed, 2),
+            "errors": len(self.errors),
+            "error_samples": self.errors[:10],
+            "elapsed_s": round(self.elapsed, 1),
+            "rss": {
+                "peak_mb": round(peak["rss_mb"] + peak["workers_rss_mb"], 1),
+                "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                "samples": self.rss_samples,
+            },
+        }
+
+# ============================== #
+#         COMMAND LINE          #
+# ============================== #
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent viewers switching weeks on the league tables.")
+    parser.add_argument("--sessions", type=int, default=10, help="concurrent sessions (default: 10)")
+    parser.add_argument("--duration", type=float, default=30, help="seconds each session keeps clicking (default: 30)")
+    parser.add_argument("--think", type=think_time, default="exp:2",
+                        help="pause between clicks: const:S, uniform:A,B, exp:MEAN or lognormal:MEDIAN,SIGMA (default: exp:2)")
+    parser.add_argument("--ramp", type=float, default=0, help="seconds over which sessions join (default: 0)")
+    parser.add_argument("--scale", type=int, default=None,
+                        help="serve synthetic results this many times the size of data.csv instead of LIONHEART_DATA")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="seconds between RSS samples (default: 1)")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds before a rerun counts as failed (default: 120)")
+    parser.add_argument("--max-p95", type=float, default=None, help="exit 1 if week-switch p95 exceeds this many ms")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.scale:
+            # Same synthetic results as bench.py, written as Arrow so loading stays off the measurement
+            from league_data import load_data
+            from storage import backend_for
+
+            path = os.path.join(workdir, f"{args.scale}x.arrow")
+            backend_for(path).write(synthesize(rows=len(load_data("data.csv")) * args.scale), path)
+            os.environ["LIONHEART_DATA"] = path
+
+        print(f"Running {args.sessions} sessions for {args.duration:.0f}s", file=sys.stderr)
+        test = LoadTest(args.sessions, args.duration, args.think, ramp=args.ramp, timeout=args.timeout,
+                        seed=args.seed)
+        results = test.run(args.sample_interval)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "sessions": args.sessions,
+            "duration_s": args.duration,
+            "ramp_s": args.ramp,
+            "scale": args.scale,
+            "render_workers": os.environ.get("LIONHEART_RENDER_WORKERS"),
+            "shared_cache": os.environ.get("LIONHEART_CACHE"),
+        },
+        **results,
+    }
+    output = json.dumps(report, indent=2, default=str)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    switch = results["latency"].get("switch")
+    if switch:
+        print(f"Week switch p50 {switch['p50_ms']} ms, p95 {switch['p95_ms']} ms, p99 {switch['p99_ms']} ms, "
+              f"{results['throughput_rps']} reruns/s, peak RSS {results['rss']['peak_mb']} MB", file=sys.stderr)
+    if args.max_p95 is not None and (switch is None or switch["p95_ms"] > args.max_p95 or results["errors"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
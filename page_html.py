@@ -0,0 +1,25 @@
+# ============================== #
+#       SHARED PAGE BLOCKS      #
+# ============================== #
+
+# HTML banners shown on the Streamlit page and on every page of the static
+# site export, kept here so both stay in step.
+
+# --- Credits banner ---
+CREDITS_HTML = """
+    <div style='display: flex; justify-content: center; align-items: center; margin-top: 1.5rem; margin-bottom: 2.5rem; font-size: 16px; color: #CCCCCC;'>
+        <span>Designed by <strong>Kalungi Analytics</strong> · 
+            <a href='https://www.linkedin.com/in/ben-sharpe-49659a207/' target='_blank' style='color: #FF6B6B; text-decoration: none; margin-left: 4px;'>
+                Connect on LinkedIn
+            </a>
+        </span>
+    </div>
+"""
+
+# --- Donate banner ---
+DONATE_HTML = """
+    <div style='background-color:#3F1F5A; padding: 1.5rem; border-radius: 1rem; text-align: center; margin-bottom: 2rem;'>
+        <h2 style='color: white; margin-bottom: 1rem;'>Please consider donating to Lionheart to support the amazing efforts of our teams!</h2>
+        <a href='https://www.justgiving.com/team/sdl-lhh25' target='_blank' style='background-color: #FF6B6B; color: white; padding: 0.75rem 1.5rem; text-decoration: none; border-radius: 0.5rem; font-weight: bold; font-size: 1.1rem; display: inline-block;'>💖 Donate Now</a>
+    </div>
+"""
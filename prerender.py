@@ -0,0 +1,182 @@
+# ============================== #
+#      OFFLINE PRE-RENDERING    #
+# ============================== #
+
+# Bakes every (Week, League) chart in data.csv to image files plus a
+# manifest, so the Streamlit page can serve them without touching Matplotlib.
+# Matplotlib is only imported by the baking workers; the page imports this
+# module just for PrerenderedCharts.
+#
+#   python prerender.py --data data.csv --out prerendered --workers 4
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import icons
+from league_data import load_table
+
+MANIFEST_NAME = "manifest.json"
+DEFAULT_OUT_DIR = "prerendered"
+
+# ============================== #
+#          BAKING (CLI)         #
+# ============================== #
+
+# --- Per-worker state, loaded once by the pool initializer ---
+_worker = {}
+
+
+def _init_worker(data_path):
+    import matplotlib
+    matplotlib.use("Agg")
+
+    _worker["table"], _ = load_table(data_path)
+    _worker["flag_img"] = icons.safe_load_image(icons.flag_path)
+    _worker["start_img"] = icons.safe_load_image(icons.start_path)
+    _worker["whistle_img"] = icons.safe_load_image(icons.whistle_path)
+
+
+def _render_task(week, league, fmt):
+    import figures
+    import league_charts
+
+    table = _worker["table"]
+    league_df = table.slice(week, league)
+    fig = league_charts.plot_league_data(league_df, league, _worker["flag_img"], _worker["start_img"],
+                                         _worker["whistle_img"], table.league_to_number, batched=True)
+    try:
+        payload = figures.figure_to_bytes(fig, fmt)
+    finally:
+        figures.close_figure(fig)
+    return week, league, table.fingerprint(week, league), payload
+
+
+# --- Readable, unique per league: leagues sharing a League Number (icon set) get files of their own ---
+def league_slug(league):
+    words = re.sub(r"[^a-z0-9]+", "-", league.lower()).strip("-")[:40].rstrip("-")
+    return f"{words}-{hashlib.blake2b(league.encode(), digest_size=4).hexdigest()}"
+
+
+def chart_filename(week, league, fmt):
+    return os.path.join(f"week_{week}", f"{league_slug(league)}.{fmt}")
+
+
+def file_sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+# --- (week, league, fingerprint, bytes) for every chart in the table, in completion order ---
+def render_all(data_path, table, fmt="png", workers=None):
+    jobs = [(week, league) for week in table.weeks for league in table.leagues_in_week(week)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data_path,)) as pool:
+        futures = [pool.submit(_render_task, week, league, fmt) for week, league in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def bake(data_path, out_dir, fmt="png", workers=None):
+    table, report = load_table(data_path)
+    report.log(data_path)
+    league_to_number = table.league_to_number
+
+    os.makedirs(out_dir, exist_ok=True)
+    charts = []
+    for week, league, fingerprint, payload in render_all(data_path, table, fmt, workers):
+        filename = chart_filename(week, league, fmt)
+        path = os.path.join(out_dir, filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(payload)
+        charts.append({
+            "week": week,
+            "league": league,
+            "league_number": int(league_to_number[league]),
+            "file": filename.replace(os.sep, "/"),
+            "format": fmt,
+            "fingerprint": fingerprint,
+            "bytes": len(payload),
+        })
+
+    charts.sort(key=lambda c: (c["week"], c["league_number"], c["league"]))
+    manifest = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "data_sha256": file_sha256(data_path),
+        "charts": charts,
+    }
+    # Write the manifest last and atomically, so readers never see a half-baked set
+    tmp_path = os.path.join(out_dir, MANIFEST_NAME + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(out_dir, MANIFEST_NAME))
+    return manifest
+
+# ============================== #
+#        SERVING BAKED FILES    #
+# ============================== #
+
+class PrerenderedCharts:
+    def __init__(self, out_dir=DEFAULT_OUT_DIR):
+        self.out_dir = out_dir
+        self._manifest_mtime = None
+        self._index = {}
+
+    # --- Re-read the manifest only when a new bake has replaced it ---
+    def _refresh(self):
+        path = os.path.join(self.out_dir, MANIFEST_NAME)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            self._manifest_mtime, self._index = None, {}
+            return
+        if mtime == self._manifest_mtime:
+            return
+        try:
+            with open(path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            self._manifest_mtime, self._index = None, {}
+            return
+        self._index = {(c["week"], c["league"], c["format"]): c for c in manifest.get("charts", [])}
+        self._manifest_mtime = mtime
+
+    # --- Baked bytes, or None when missing or baked from different rows ---
+    def read(self, week, league, fingerprint, fmt="png"):
+        self._refresh()
+        entry = self._index.get((int(week), league, fmt))
+        if entry is None or entry["fingerprint"] != fingerprint:
+            return None
+        try:
+            with open(os.path.join(self.out_dir, entry["file"]), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+
+prerendered_charts = PrerenderedCharts()
+
+# ============================== #
+#         COMMAND LINE          #
+# ============================== #
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-render every week x league chart to static files.")
+    parser.add_argument("--data", default="data.csv", help="results CSV (default: data.csv)")
+    parser.add_argument("--out", default=DEFAULT_OUT_DIR, help=f"output directory (default: {DEFAULT_OUT_DIR})")
+    parser.add_argument("--format", default="png", choices=["png", "svg"], help="image format (default: png)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    manifest = bake(args.data, args.out, fmt=args.format, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"Rendered {len(manifest['charts'])} charts to {args.out} in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# ============================== #
+#      RUN PROFILING            #
+# ============================== #
+
+# Per-run phase timings and cache hit/miss counters for the Streamlit page.
+# Recording is always on (a few perf_counter calls per phase); showing the
+# panel and writing log lines is switched on by LIONHEART_PROFILE=1 or by
+# opening the page with ?debug=1.
+
+import json
+import logging
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+logger = logging.getLogger("lionheart.profile")
+if not logger.handlers:
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def env_enabled():
+    return os.environ.get("LIONHEART_PROFILE", "").lower() in ("1", "true", "yes")
+
+
+class RunProfile:
+    def __init__(self, kind="page"):
+        self.kind = kind
+        self.phases = []
+        self.counters = Counter()
+        self.finished = False
+        self._started = time.perf_counter()
+        self._total = None
+
+    # --- Time a block; extra fields (e.g. league) ride along in the record ---
+    @contextmanager
+    def phase(self, name, **fields):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append({"phase": name, "ms": (time.perf_counter() - start) * 1000, **fields})
+
+    # --- A phase timed elsewhere (e.g. in a render worker) ---
+    def record(self, name, ms, **fields):
+        self.phases.append({"phase": name, "ms": ms, **fields})
+
+    def count(self, name, hit):
+        self.counters[f"{name}.{'hit' if hit else 'miss'}"] += 1
+
+    def add_counts(self, name, hits, misses):
+        if hits:
+            self.counters[f"{name}.hit"] += hits
+        if misses:
+            self.counters[f"{name}.miss"] += misses
+
+    def finish(self):
+        if not self.finished:
+            self._total = (time.perf_counter() - self._started) * 1000
+            self.finished = True
+        return self
+
+    @property
+    def total_ms(self):
+        if self._total is not None:
+            return self._total
+        return (time.perf_counter() - self._started) * 1000
+
+    def summary(self):
+        return {
+            "run": self.kind,
+            "total_ms": round(self.total_ms, 3),
+            "phases": [{**p, "ms": round(p["ms"], 3)} for p in self.phases],
+            "counters": dict(self.counters),
+        }
+
+    # --- One JSON line per run ---
+    def log(self, **fields):
+        logger.info(json.dumps({"event": "rerun_profile", **fields, **self.summary()}, default=str))
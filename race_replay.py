@@ -0,0 +1,150 @@
+# ============================== #
+#          RACE REPLAY          #
+# ============================== #
+
+# Animated week-by-week replay of one league: each team's runner icon slides
+# from its % in one week to the next and teams swap places as they overtake.
+# Same icons, colours and 0%/100% markers as plot_league_data.
+#
+# Frames are drawn incrementally. The static background (axes, dashed
+# markers, whistle and flag) is drawn once and saved; each frame restores it
+# and redraws only the icon and label layers, then the frames are encoded as
+# one GIF. Callers cache the result per league and data version (see
+# render_pool.render_replay), so a replay is built once, not per viewer.
+
+import io
+
+from PIL import Image
+
+from chart_style import BACKGROUND, MARKER_COLOR, NAME_COLOR, TARGET_PCT, label_color, label_text
+from figures import close_figure, new_figure
+from icons import IMAGES_DIR, RENDER_DPI, load_league_images
+from league_charts import LabelLayer, SpriteLayer
+
+# --- Small enough that Streamlit serves the GIF as-is (it re-encodes anything wider than 1460 px) ---
+REPLAY_DPI = 72
+FIGURE_WIDTH = 14
+ROW_HEIGHT = 0.65
+MAX_TEAMS = 30
+
+# --- Frames per week-to-week move, and frames each week is held for ---
+TWEEN_FRAMES = 10
+HOLD_FRAMES = 8
+FRAME_MS = 80
+PALETTE_COLORS = 128
+
+
+def _ease(t):
+    return t * t * (3 - 2 * t)
+
+
+# --- Per-week % for each team (carried forward over weeks it missed), best final teams only ---
+def week_progress(history, max_teams=MAX_TEAMS):
+    progress = history.pivot_table(index="Team Name", columns="Week", values="% Distance Covered",
+                                   aggfunc="last", observed=True)
+    progress = progress.sort_index(axis=1).ffill(axis=1).fillna(0.0)
+    progress.index = progress.index.astype(object)
+    final = progress.iloc[:, -1].sort_values(ascending=False, kind="stable")
+    return progress.loc[final.index[:max_teams]]
+
+
+# --- Row for each team in each week: 0 is the bottom (lowest %), as in plot_league_data ---
+def week_rows(progress):
+    rows = progress.rank(axis=0, method="first", ascending=True) - 1
+    return rows.to_numpy(dtype=float)
+
+
+# --- (week, values, rows) per frame: holds on each week, eased moves between them ---
+def replay_frames(progress, tween=TWEEN_FRAMES, hold=HOLD_FRAMES):
+    weeks = list(progress.columns)
+    values = progress.to_numpy(dtype=float)
+    rows = week_rows(progress)
+    for i, week in enumerate(weeks):
+        for _ in range(hold):
+            yield week, values[:, i], rows[:, i]
+        if i + 1 < len(weeks):
+            for step in range(1, tween):
+                t = _ease(step / tween)
+                shown = week if t < 0.5 else weeks[i + 1]
+                yield (shown, values[:, i] + (values[:, i + 1] - values[:, i]) * t,
+                       rows[:, i] + (rows[:, i + 1] - rows[:, i]) * t)
+
+
+# --- Encoded replay for one league's rows across every week; empty bytes with nothing to show ---
+def replay_bytes(history, league_name, league_number, flag_img, whistle_img, images_dir=IMAGES_DIR, fmt="gif"):
+    runner_images = load_league_images(league_number, images_dir)
+    if history.empty or not runner_images:
+        return b""
+    progress = week_progress(history)
+    teams = list(progress.index)
+    num_rows = len(teams)
+    # Icons keep to their team throughout, in final-standings order like the static chart
+    team_icons = [runner_images[(num_rows - 1 - i) % len(runner_images)] for i in range(num_rows)]
+
+    # --- Fixed frame: margins sized for the longest name on the left and banners on top ---
+    name_width = max(LabelLayer._text_path(team, 16, "bold")[1].x1 for team in teams) / 72
+    banner_height = max((img.shape[0] for img in (flag_img, whistle_img) if img is not None), default=0) / RENDER_DPI
+    height = ROW_HEIGHT * (num_rows + 1) + banner_height + 0.3
+    left = (name_width + 0.3) / FIGURE_WIDTH
+    right = 1.1 / FIGURE_WIDTH
+    top = (banner_height + 0.3) / height
+
+    fig = new_figure(figsize=(FIGURE_WIDTH, height), dpi=REPLAY_DPI, facecolor=BACKGROUND)
+    try:
+        ax = fig.add_axes((left, 0, 1 - left - right, 1 - top))
+        ax.set_facecolor(BACKGROUND)
+        ax.axis("off")
+        max_value = float(progress.to_numpy().max())
+        ax.set_xlim(0, max(110, max_value + 5))
+        ax.set_ylim(-1, num_rows - 1 + 1.2)
+        ax.axvline(x=0, color=MARKER_COLOR, linestyle="--", linewidth=0.75)
+        ax.axvline(x=TARGET_PCT, color=MARKER_COLOR, linestyle="--", linewidth=0.75)
+
+        start_y = num_rows - 0.5 + 0.2
+        banners = SpriteLayer(ax)
+        if whistle_img is not None:
+            banners.add(whistle_img, (0, start_y), box_alignment=(0.5, 0))
+        if flag_img is not None:
+            banners.add(flag_img, (102.5, start_y), box_alignment=(0.5, 0))
+        ax.add_artist(banners)
+
+        # --- Moving layers are animated: left out of the background, drawn per frame ---
+        sprites = SpriteLayer(ax)
+        labels = LabelLayer(ax)
+        for layer in (sprites, labels):
+            layer.set_animated(True)
+            ax.add_artist(layer)
+
+        canvas = fig.canvas
+        canvas.draw()
+        background = canvas.copy_from_bbox(fig.bbox)
+        size = canvas.get_width_height(physical=True)
+        week_x = ax.get_xlim()[1]
+
+        frames = []
+        for week, values, rows in replay_frames(progress):
+            canvas.restore_region(background)
+            sprites.clear()
+            labels.clear()
+            for team, img, value, row in zip(teams, team_icons, values, rows):
+                sprites.add(img, (value, row))
+                labels.add(value - 2.5, row, team, 16, NAME_COLOR, ha="right", weight="bold")
+                labels.add(value + 4.5, row, label_text(value), 14, label_color(value))
+            labels.add(week_x, start_y + 0.5, f"Week {week}", 20, NAME_COLOR, ha="right", weight="bold")
+            ax.draw_artist(sprites)
+            ax.draw_artist(labels)
+            frames.append(Image.frombuffer("RGBA", size, bytes(canvas.buffer_rgba()), "raw", "RGBA", 0, 1).convert("RGB"))
+    finally:
+        close_figure(fig)
+
+    return encode_frames(frames, fmt)
+
+
+# --- Frames as one looping animation, quantised to a single palette taken from the last frame ---
+def encode_frames(frames, fmt="gif"):
+    palette = frames[-1].quantize(colors=PALETTE_COLORS, method=Image.Quantize.MEDIANCUT)
+    indexed = [frame.quantize(palette=palette, dither=Image.Dither.NONE) for frame in frames]
+    buffer = io.BytesIO()
+    indexed[0].save(buffer, format=fmt, save_all=True, append_images=indexed[1:], duration=FRAME_MS, loop=0,
+                    optimize=False)
+    return buffer.getvalue()
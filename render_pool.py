@@ -0,0 +1,261 @@
+# ============================== #
+#        CHART RENDER POOL      #
+# ============================== #
+
+# Renders league charts in a bounded pool of worker processes, so several
+# leagues draw at once, off the GIL and off the global pyplot state, and the
+# Streamlit script threads only wait on futures. Each worker imports the
+# plotting module once (font registered, banner icons decoded) and keeps its
+# own icon store warm across charts.
+#
+# Submissions past max_pending block the caller until a slot frees up, and a
+# chart already being drawn is shared rather than drawn twice. workers=0
+# renders in the calling process instead.
+#
+# With a shared cache (shared_cache.py) the same holds across replicas: a
+# chart another replica has drawn is taken from the cache, and one it is
+# drawing right now is waited for instead of being drawn again here.
+
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+# ============================== #
+#          WORKER SIDE          #
+# ============================== #
+
+_worker = {}
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use("Agg")
+
+    import league_charts
+    _worker["banners"] = tuple(league_charts.safe_load_image(path) for path in
+                               (league_charts.flag_path, league_charts.start_path, league_charts.whistle_path))
+
+
+# --- Chart bytes plus timings and icon store counts, for the page's run profile ---
+def render_chart(league_df, league_name, league_number, images_dir, fmt="png"):
+    if not _worker:
+        _init_worker()
+    import figures
+    import league_charts
+    from icons import icon_store
+
+    icon_hits, icon_misses = icon_store.hits, icon_store.misses
+    start = time.perf_counter()
+    fig = league_charts.plot_league_data(league_df, league_name, *_worker["banners"], {league_name: league_number},
+                                         batched=True, images_dir=images_dir)
+    drawn = time.perf_counter()
+    try:
+        payload = figures.figure_to_bytes(fig, fmt)
+    finally:
+        figures.close_figure(fig)
+    stats = {
+        "plot_ms": (drawn - start) * 1000,
+        "rasterise_ms": (time.perf_counter() - drawn) * 1000,
+        "icon_hits": icon_store.hits - icon_hits,
+        "icon_misses": icon_store.misses - icon_misses,
+        "pid": os.getpid(),
+        "source": "render",
+        "figures": figures.stats(),
+    }
+    return payload, stats
+
+
+# --- Race replay animation bytes (see race_replay.py) plus timings ---
+def render_replay(history, league_name, league_number, images_dir, fmt="gif"):
+    if not _worker:
+        _init_worker()
+    import figures
+    import race_replay
+
+    flag_img, _, whistle_img = _worker["banners"]
+    start = time.perf_counter()
+    payload = race_replay.replay_bytes(history, league_name, league_number, flag_img, whistle_img, images_dir, fmt)
+    stats = {
+        "replay_ms": (time.perf_counter() - start) * 1000,
+        "pid": os.getpid(),
+        "source": "render",
+        "figures": figures.stats(),
+    }
+    return payload, stats
+
+
+def _render_here(task, *args):
+    future = Future()
+    try:
+        future.set_result(task(*args))
+    except Exception as exc:
+        future.set_exception(exc)
+    return future
+
+
+def _ping():
+    return os.getpid()
+
+
+# ============================== #
+#           PAGE SIDE           #
+# ============================== #
+
+# --- Streamlit installs the page script as __main__, which spawned workers would re-run on start-up ---
+@contextmanager
+def _plain_main():
+    main = sys.modules["__main__"]
+    sys.modules["__main__"] = sys.modules[__name__]
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = main
+
+
+class RenderPool:
+    def __init__(self, workers=DEFAULT_WORKERS, max_pending=None, cache=None):
+        self.workers = max(0, workers)
+        self.max_pending = max_pending or 2 * max(1, self.workers)
+        self.cache = cache
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._waiters = None
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.shared = 0
+        # --- Latest figures.stats() from each process that drew a chart, by pid ---
+        self.figure_stats = {}
+
+    # --- Start every worker up front, so none is spawned later from a page script thread ---
+    def _pool(self):
+        if self._executor is None:
+            # Spawned, not forked: the Streamlit server is multi-threaded
+            executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                           mp_context=multiprocessing.get_context("spawn"))
+            with _plain_main():
+                wait([executor.submit(_ping) for _ in range(self.workers)])
+            self._executor = executor
+        return self._executor
+
+    # --- Future of (payload, stats) for the chart under key; blocks while the pool is full ---
+    # task is render_chart or render_replay; both take (rows, league name, league number, images dir, fmt)
+    def submit(self, key, league_df, league_name, league_number, images_dir, fmt="png", task=render_chart):
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.shared += 1
+                return future
+
+        args = (league_df, league_name, league_number, images_dir, fmt)
+        if self.cache is None:
+            return self._submit(key, args, task)
+
+        payload = self.cache.get("chart", key)
+        if payload is not None:
+            future = Future()
+            future.set_result((payload, {"source": "shared_cache"}))
+            return future
+        if not self.cache.try_lock("chart", key):
+            # Another replica is drawing it: wait for its result off the script thread
+            wait_key = ("wait",) + key
+            with self._lock:
+                if self._waiters is None:
+                    self._waiters = ThreadPoolExecutor(max_workers=self.max_pending, thread_name_prefix="chart-wait")
+                future = self._inflight.get(wait_key)
+                if future is None:
+                    future = self._inflight[wait_key] = self._waiters.submit(self._wait_or_render, key, args, task)
+                    future.add_done_callback(lambda done: self._forget(wait_key, done))
+                else:
+                    self.shared += 1
+            return future
+
+        try:
+            future = self._submit(key, args, task)
+        except BaseException:
+            self.cache.unlock("chart", key)
+            raise
+        future.add_done_callback(lambda done: self._store(key, done))
+        return future
+
+    def _store(self, key, future):
+        try:
+            if not future.cancelled() and future.exception() is None:
+                self.cache.set("chart", key, future.result()[0])
+        finally:
+            self.cache.unlock("chart", key)
+
+    def _wait_or_render(self, key, args, task):
+        payload = self.cache.wait("chart", key)
+        if payload is not None:
+            return payload, {"source": "shared_wait"}
+        # The other replica gave up or timed out: draw it here after all
+        payload, stats = self.result(self._submit(key, args, task), *args, task=task)
+        self.cache.set("chart", key, payload)
+        return payload, stats
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def _submit(self, key, args, task=render_chart):
+        if self.workers == 0:
+            return _render_here(task, *args)
+
+        self._slots.acquire()
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                # Someone else queued it while this caller waited for a slot
+                self._slots.release()
+                self.shared += 1
+                return future
+            try:
+                future = self._pool().submit(task, *args)
+            except BrokenProcessPool:
+                # A worker died: start a fresh pool on the next submit and draw this one here
+                self._slots.release()
+                executor, self._executor = self._executor, None
+                executor.shutdown(wait=False, cancel_futures=True)
+                return _render_here(task, *args)
+            except BaseException:
+                self._slots.release()
+                raise
+            self._inflight[key] = future
+            self.submitted += 1
+        future.add_done_callback(lambda done: self._finished(key, done))
+        return future
+
+    def _finished(self, key, future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        self._slots.release()
+
+    # --- Result of a submitted chart; a crashed pool is replaced and the chart drawn here instead ---
+    def result(self, future, league_df, league_name, league_number, images_dir, fmt="png", task=render_chart):
+        try:
+            payload, stats = future.result()
+        except BrokenProcessPool:
+            self.restart()
+            payload, stats = task(league_df, league_name, league_number, images_dir, fmt)
+        if "figures" in stats:
+            self.figure_stats[stats["pid"]] = stats["figures"]
+        return payload, stats
+
+    def restart(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def pending(self):
+        return len(self._inflight)
@@ -0,0 +1,74 @@
+# ============================== #
+#         ROLLUP BOARDS         #
+# ============================== #
+
+# Aggregate leaderboards by Category and by League for every week, computed in
+# one vectorised group-by per data version (see LeagueTable.rollups), so a page
+# only looks up a finished board.
+#
+#   Teams          teams with a result that week
+#   Mean / Median  % Distance Covered across those teams
+#   ≥ 85% / ≥ 100% share of teams at or past the label colour thresholds
+#   Δ Mean         change in the mean since the group's previous week
+#   Δ ≥ 100%       change in the share past target since then
+#
+# Boards are ranked by mean, best first.
+
+import numpy as np
+import pandas as pd
+
+from chart_style import CLOSE_PCT, TARGET_PCT
+
+LEVELS = ["Category", "League"]
+GROUP_KEY = ["Level", "Group"]
+BOARD_COLUMNS = ["Rank", "Group", "Teams", "Mean", "Median", "≥ 85%", "≥ 100%", "Δ Mean", "Δ ≥ 100%"]
+
+
+# --- Every (level, week) board from frame's rows ---
+def _compute(frame):
+    weeks = frame["Week"].to_numpy()
+    values = frame["% Distance Covered"].to_numpy(dtype=float)
+    levels = [level for level in LEVELS if level in frame.columns]
+
+    # Rows stacked once per level, so one group-by covers every board
+    stacked = pd.DataFrame({
+        "Level": np.repeat(levels, len(frame)),
+        "Group": np.concatenate([frame[level].astype(object).to_numpy() for level in levels]) if levels else [],
+        "Week": np.tile(weeks, len(levels)),
+        "value": np.tile(values, len(levels)),
+    })
+    stacked["close"] = stacked["value"] >= CLOSE_PCT
+    stacked["target"] = stacked["value"] >= TARGET_PCT
+
+    boards = stacked.groupby(["Level", "Group", "Week"], sort=True).agg(
+        Teams=("value", "size"),
+        Mean=("value", "mean"),
+        Median=("value", "median"),
+        close=("close", "mean"),
+        target=("target", "mean"),
+    ).reset_index()
+    boards["≥ 85%"] = boards.pop("close") * 100
+    boards["≥ 100%"] = boards.pop("target") * 100
+
+    # Sorted by week within each group, so a diff is the change since the group's previous week
+    group = boards.groupby(GROUP_KEY, sort=False)
+    boards["Δ Mean"] = group["Mean"].diff()
+    boards["Δ ≥ 100%"] = group["≥ 100%"].diff()
+
+    boards = boards.sort_values(["Level", "Week", "Mean"], ascending=[True, True, False], kind="stable")
+    boards["Rank"] = boards.groupby(["Level", "Week"], sort=False)["Mean"].rank(method="min", ascending=False).astype(int)
+    return {(level, int(week)): board[BOARD_COLUMNS].rename(columns={"Group": level}).reset_index(drop=True)
+            for (level, week), board in boards.groupby(["Level", "Week"], sort=False)}
+
+
+class Rollups:
+    def __init__(self, table):
+        self.table = table
+        self.boards = _compute(table.frame)
+
+    # --- Leaderboard of level ("Category" or "League") groups in week, best mean first ---
+    def board(self, level, week):
+        board = self.boards.get((level, int(week)))
+        if board is None:
+            return pd.DataFrame(columns=BOARD_COLUMNS).rename(columns={"Group": level})
+        return board
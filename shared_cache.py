@@ -0,0 +1,457 @@
+# ============================== #
+#        SHARED RESULT CACHE    #
+# ============================== #
+
+# A second cache level that several server replicas can share, under the
+# in-process ones (chart_cache, icon_store). Parsed CSVs, decoded icons and
+# rendered charts go in here, so a replica that comes up cold can take them
+# from one that has already done the work instead of redoing it.
+#
+# Picked with LIONHEART_CACHE (unset: no shared cache):
+#
+#   memory://                   in-process LRU (one replica, or for testing)
+#   disk:///var/cache/lionheart  files on a volume every replica mounts
+#   kv://127.0.0.1:6380         kv_server.py, a local stand-in for Redis
+#   redis://cache:6379/0        Redis (needs the redis package)
+#
+# Backends share a small byte-string interface: get, set with a TTL, add
+# (set-if-absent, used as a lock), delete, and delete_if (delete only while
+# the key still holds a given value). Size limits are per backend. Only one
+# replica renders a given chart: it takes a short-lived lock key holding its
+# own token, the others wait for its result rather than all rendering at
+# once, and it releases the lock only if the lock is still its own.
+#
+# Values are pickled, so only point replicas at a cache they alone can write.
+# kv:// needs LIONHEART_CACHE_AUTHKEY, the secret kv_server.py was started with.
+
+import hashlib
+import logging
+import os
+import pickle
+import struct
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_TTL = 24 * 3600
+LOCK_TTL = 60
+
+_backends = {}
+
+
+# --- Secret for kv:// connections; empty when unset, as there is no safe default ---
+def authkey_from_env():
+    return os.environ.get("LIONHEART_CACHE_AUTHKEY", "").encode()
+
+
+def register_backend(*schemes):
+    def register(cls):
+        for scheme in schemes:
+            _backends[scheme] = cls
+        return cls
+    return register
+
+# ============================== #
+#            BACKENDS           #
+# ============================== #
+
+@register_backend("memory")
+class MemoryBackend:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, max_entries=10000):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_url(cls, url, options):
+        return cls(max_bytes=int(options.get("max_bytes", DEFAULT_MAX_BYTES)),
+                   max_entries=int(options.get("max_entries", 10000)))
+
+    def _live(self, key, now):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] is not None and entry[0] <= now:
+            self._bytes -= len(self._entries.pop(key)[1])
+            return None
+        return entry
+
+    def get(self, key):
+        with self._lock:
+            entry = self._live(key, time.time())
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[1])
+            self._entries[key] = (time.time() + ttl if ttl else None, value)
+            self._bytes += len(value)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def add(self, key, value, ttl=None):
+        with self._lock:
+            if self._live(key, time.time()) is not None:
+                return False
+            self._entries[key] = (time.time() + ttl if ttl else None, value)
+            self._bytes += len(value)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= len(entry[1])
+
+    def delete_if(self, key, value):
+        with self._lock:
+            entry = self._live(key, time.time())
+            if entry is None or entry[1] != value:
+                return False
+            self._bytes -= len(self._entries.pop(key)[1])
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+# --- One file per key; the first 8 bytes hold the expiry time (0 for none) ---
+@register_backend("disk")
+class DiskBackend:
+    HEADER = struct.Struct(">d")
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES, prune_every=64):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.prune_every = prune_every
+        self._writes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_url(cls, url, options):
+        directory = (url.netloc + url.path) or ".cache/shared"
+        return cls(directory, max_bytes=int(options.get("max_bytes", DEFAULT_MAX_BYTES)))
+
+    def _path(self, key):
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest + ".bin")
+
+    def _read(self, path):
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        (expires,) = self.HEADER.unpack_from(data)
+        if expires and expires <= time.time():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return data[self.HEADER.size:]
+
+    def get(self, key):
+        return self._read(self._path(key))
+
+    def set(self, key, value, ttl=None):
+        if len(value) > self.max_bytes:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.HEADER.pack(time.time() + ttl if ttl else 0))
+            f.write(value)
+        os.replace(tmp_path, path)
+        self._writes += 1
+        if self._writes % self.prune_every == 0:
+            self.prune()
+
+    # --- Atomic across processes and hosts sharing the volume: link() fails if the name exists ---
+    def add(self, key, value, ttl=None):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.HEADER.pack(time.time() + ttl if ttl else 0))
+            f.write(value)
+        try:
+            for _ in range(2):
+                try:
+                    os.link(tmp_path, path)
+                    return True
+                except FileExistsError:
+                    if self._read(path) is not None:
+                        return False
+                    # Expired lock left by a replica that died mid-render: _read removed it, try again
+            return False
+        finally:
+            os.remove(tmp_path)
+
+    def delete(self, key):
+        self._remove(self._path(key))
+
+    # --- Renamed aside first, so what is compared is exactly what gets deleted ---
+    def delete_if(self, key, value):
+        path = self._path(key)
+        claimed = f"{path}.{os.getpid()}.{threading.get_ident()}.del"
+        try:
+            os.rename(path, claimed)
+        except OSError:
+            return False
+        try:
+            if self._read(claimed) == value:
+                return True
+            # Someone else's: put it back, unless a newer one has already taken the name
+            try:
+                os.link(claimed, path)
+            except FileExistsError:
+                pass
+            return False
+        finally:
+            self._remove(claimed)
+
+    # --- Drop expired entries, then the least recently written until under max_bytes ---
+    def prune(self):
+        now = time.time()
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if not name.endswith(".bin"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    with open(path, "rb") as f:
+                        (expires,) = self.HEADER.unpack(f.read(self.HEADER.size))
+                    stat = os.stat(path)
+                except (OSError, struct.error):
+                    continue
+                if expires and expires <= now:
+                    self._remove(path)
+                else:
+                    files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                self._remove(os.path.join(root, name))
+
+
+# --- Client for kv_server.py; one connection per thread, reconnecting after errors ---
+@register_backend("kv")
+class KeyValueBackend:
+    def __init__(self, address, authkey=None):
+        self.address = address
+        self.authkey = authkey if authkey is not None else authkey_from_env()
+        if not self.authkey:
+            raise RuntimeError("LIONHEART_CACHE=kv://... needs LIONHEART_CACHE_AUTHKEY set to kv_server.py's secret")
+        self._local = threading.local()
+
+    @classmethod
+    def from_url(cls, url, options):
+        return cls((url.hostname or "127.0.0.1", url.port or 6380))
+
+    def _call(self, *request):
+        from multiprocessing.connection import Client
+
+        for attempt in range(2):
+            connection = getattr(self._local, "connection", None)
+            try:
+                if connection is None:
+                    connection = self._local.connection = Client(self.address, authkey=self.authkey)
+                connection.send(request)
+                return connection.recv()
+            except (OSError, EOFError):
+                self._local.connection = None
+                if attempt:
+                    raise
+
+    def get(self, key):
+        return self._call("get", key)
+
+    def set(self, key, value, ttl=None):
+        self._call("set", key, value, ttl)
+
+    def add(self, key, value, ttl=None):
+        return self._call("add", key, value, ttl)
+
+    def delete(self, key):
+        self._call("delete", key)
+
+    def delete_if(self, key, value):
+        return self._call("delete_if", key, value)
+
+    def clear(self):
+        self._call("clear")
+
+
+@register_backend("redis", "rediss")
+class RedisBackend:
+    # Compare-and-delete in one step on the server
+    DELETE_IF = """
+    if redis.call("get", KEYS[1]) == ARGV[1] then return redis.call("del", KEYS[1]) end
+    return 0
+    """
+
+    def __init__(self, url):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("LIONHEART_CACHE=redis://... needs the redis package (pip install redis)") from None
+        self._client = redis.Redis.from_url(url)
+
+    @classmethod
+    def from_url(cls, url, options):
+        return cls(url.geturl())
+
+    def get(self, key):
+        return self._client.get(key)
+
+    def set(self, key, value, ttl=None):
+        self._client.set(key, value, ex=int(ttl) if ttl else None)
+
+    def add(self, key, value, ttl=None):
+        return bool(self._client.set(key, value, ex=int(ttl) if ttl else None, nx=True))
+
+    def delete(self, key):
+        self._client.delete(key)
+
+    def delete_if(self, key, value):
+        return bool(self._client.eval(self.DELETE_IF, 1, key, value))
+
+    def clear(self):
+        self._client.flushdb()
+
+# ============================== #
+#       CACHE WITH LOCKING      #
+# ============================== #
+
+class SharedCache:
+    def __init__(self, backend, namespace="lionheart", lock_ttl=LOCK_TTL, poll_interval=0.05):
+        self.backend = backend
+        self.namespace = namespace
+        self.lock_ttl = lock_ttl
+        self.poll_interval = poll_interval
+        self._token = uuid.uuid4().hex.encode()
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.errors = 0
+
+    def _key(self, kind, key):
+        return f"{self.namespace}:{kind}:{hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()}"
+
+    # --- A cache that is down behaves as an empty one; the page never fails on it ---
+    def _safely(self, operation, *args, default=None):
+        try:
+            return operation(*args)
+        except Exception as exc:
+            self.errors += 1
+            if self.errors == 1 or self.errors % 100 == 0:
+                logger.warning("Shared cache %s failed (%d so far): %s", operation.__name__, self.errors, exc)
+            return default
+
+    def get(self, kind, key):
+        value = self._safely(self.backend.get, self._key(kind, key))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, kind, key, value, ttl=DEFAULT_TTL):
+        self._safely(self.backend.set, self._key(kind, key), value, ttl)
+
+    def get_object(self, kind, key):
+        value = self.get(kind, key)
+        return None if value is None else pickle.loads(value)
+
+    def set_object(self, kind, key, value, ttl=DEFAULT_TTL):
+        self.set(kind, key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), ttl)
+
+    # --- Render lock: true for the one caller (across replicas) that should compute key ---
+    def try_lock(self, kind, key):
+        return self._safely(self.backend.add, self._key("lock:" + kind, key), self._token, self.lock_ttl, default=True)
+
+    # --- Releases the lock only while it is still ours: one that outlived lock_ttl may belong to another replica now ---
+    def unlock(self, kind, key):
+        self._safely(self.backend.delete_if, self._key("lock:" + kind, key), self._token)
+
+    # --- Value once the lock holder stores it; None if the lock is dropped or times out first ---
+    def wait(self, kind, key, timeout=None):
+        self.waits += 1
+        deadline = time.monotonic() + (timeout or self.lock_ttl)
+        lock_key = self._key("lock:" + kind, key)
+        while time.monotonic() < deadline:
+            value = self._safely(self.backend.get, self._key(kind, key))
+            if value is not None:
+                self.hits += 1
+                return value
+            if self._safely(self.backend.get, lock_key) is None:
+                # Holder gave up (or its lock expired) without storing anything
+                return self._safely(self.backend.get, self._key(kind, key))
+            time.sleep(self.poll_interval)
+        return None
+
+    # --- Cached object, or compute() run by exactly one caller while the rest wait for it ---
+    def get_or_compute(self, kind, key, compute, ttl=DEFAULT_TTL):
+        value = self.get_object(kind, key)
+        if value is not None:
+            return value
+        if not self.try_lock(kind, key):
+            payload = self.wait(kind, key)
+            if payload is not None:
+                return pickle.loads(payload)
+            return compute()
+        try:
+            value = compute()
+            self.set_object(kind, key, value, ttl)
+            return value
+        finally:
+            self.unlock(kind, key)
+
+
+# --- SharedCache for a LIONHEART_CACHE-style URL; None for an empty one ---
+def open_cache(url):
+    if not url or url == "none":
+        return None
+    parsed = urlparse(url)
+    try:
+        backend_cls = _backends[parsed.scheme]
+    except KeyError:
+        raise ValueError(f"No shared cache backend for {parsed.scheme!r}: {url}") from None
+    options = {name: values[-1] for name, values in parse_qs(parsed.query).items()}
+    return SharedCache(backend_cls.from_url(parsed, options), namespace=options.get("namespace", "lionheart"))
+
+
+shared_cache = open_cache(os.environ.get("LIONHEART_CACHE", ""))
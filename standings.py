@@ -0,0 +1,137 @@
+# ============================== #
+#        STANDINGS ENGINE       #
+# ============================== #
+
+# Rank, movement and trend for every team in every week, computed in one
+# vectorised pass and kept row-aligned with LeagueTable.frame, so a league's
+# standings are the same O(1) slice as its chart rows.
+#
+#   Rank         1 = furthest in the league that week (ties share a rank)
+#   Rank Change  places gained since the team's previous week (+ is up)
+#   Change       % points gained since the team's previous week
+#   Best Week    week of the team's biggest gain so far, and that gain
+#
+# When rows arrive for a week, only that week and the ones after it are
+# recomputed, seeded from each team's last standing before it.
+
+import numpy as np
+import pandas as pd
+
+TEAM_KEY = ["League", "Team Name"]
+
+
+# --- ▲/▼ arrows with the places moved; "new" for a team's first week ---
+def _movement(rank_change):
+    change = rank_change.to_numpy()
+    magnitude = np.abs(np.nan_to_num(change)).astype(int).astype(str)
+    move = np.where(change > 0, np.char.add("▲ ", magnitude),
+                    np.where(change < 0, np.char.add("▼ ", magnitude), "–"))
+    return pd.Series(np.where(np.isnan(change), "new", move), index=rank_change.index)
+
+
+# --- Standings for frame's rows; seed holds each team's last standing before them ---
+def _compute(frame, seed=None):
+    # Plain object keys, so groupby never walks the categoricals' unused categories
+    history = pd.DataFrame({
+        "League": frame["League"].astype(object).to_numpy(),
+        "Team Name": frame["Team Name"].astype(object).to_numpy(),
+        "Week": frame["Week"].to_numpy(),
+        "value": frame["% Distance Covered"].to_numpy(dtype=float),
+    })
+    history["Rank"] = history.groupby(["Week", "League"], sort=False)["value"].rank(method="min", ascending=False)
+
+    # LeagueTable rows are in week order, so per-team shifts walk each team's weeks in order
+    team = history.groupby(TEAM_KEY, sort=False)
+    prev_value = team["value"].shift()
+    prev_rank = team["Rank"].shift()
+
+    if seed is not None and len(seed):
+        first = prev_value.isna()
+        seeded = history[TEAM_KEY].merge(seed, how="left", left_on=TEAM_KEY, right_index=True).set_index(history.index)
+        prev_value = prev_value.where(~first, seeded["value"])
+        prev_rank = prev_rank.where(~first, seeded["Rank"])
+        seed_gain, seed_week = seeded["Best Gain"], seeded["Best Week"]
+    else:
+        seed_gain = pd.Series(np.nan, index=history.index)
+        seed_week = pd.Series(np.nan, index=history.index)
+
+    # Progress is cumulative, so a team's first week gains everything it has covered
+    gain = history["value"] - prev_value.fillna(0)
+    running_best = gain.groupby([history[column] for column in TEAM_KEY], sort=False).cummax()
+    best_week = history["Week"].where(gain == running_best).groupby(
+        [history[column] for column in TEAM_KEY], sort=False).ffill()
+    # An earlier, larger gain from before this recompute still wins
+    from_seed = seed_gain.notna() & (seed_gain > running_best)
+
+    result = pd.DataFrame({
+        "Rank": history["Rank"].astype(int),
+        "Rank Change": prev_rank - history["Rank"],
+        "Change": history["value"] - prev_value,
+        "Best Week": best_week.where(~from_seed, seed_week).astype(int),
+        "Best Gain": running_best.where(~from_seed, seed_gain),
+    })
+    result["Move"] = _movement(result["Rank Change"])
+    return result
+
+
+class Standings:
+    def __init__(self, table):
+        self.table = table
+        self.frame = _compute(table.frame)
+
+    # --- Standings for a table extended with rows for the given weeks ---
+    def extend(self, table, affected_weeks):
+        if not affected_weeks:
+            standings = Standings.__new__(Standings)
+            standings.table, standings.frame = table, self.frame
+            return standings
+
+        # Weeks before the first affected one keep their rows and positions
+        first = min(affected_weeks)
+        kept_stop = table.week_frame(first).index[0] if len(table.week_frame(first)) else len(table.frame)
+        kept = self.frame.iloc[:kept_stop]
+        seed = self._seed(kept)
+
+        standings = Standings.__new__(Standings)
+        standings.table = table
+        recomputed = _compute(table.frame.iloc[kept_stop:], seed).set_axis(
+            pd.RangeIndex(kept_stop, len(table.frame)))
+        standings.frame = pd.concat([kept, recomputed]) if len(kept) else recomputed
+        return standings
+
+    # --- Each team's last standing, keyed by (League, Team Name) ---
+    def _seed(self, kept):
+        if not len(kept):
+            return None
+        rows = self.table.frame.iloc[:len(kept)]
+        state = pd.DataFrame({
+            "League": rows["League"].astype(object).to_numpy(),
+            "Team Name": rows["Team Name"].astype(object).to_numpy(),
+            "value": rows["% Distance Covered"].to_numpy(dtype=float),
+            "Rank": kept["Rank"].to_numpy(),
+            "Best Week": kept["Best Week"].to_numpy(),
+            "Best Gain": kept["Best Gain"].to_numpy(),
+        })
+        # Kept rows are in week order, so the last row per team is its latest week
+        return state.drop_duplicates(subset=TEAM_KEY, keep="last").set_index(TEAM_KEY)
+
+    # --- Standings rows for one league in one week, aligned with LeagueTable.slice ---
+    def slice(self, week, league):
+        rows = self.table.slice(week, league)
+        if rows.empty:
+            return self.frame.iloc[0:0]
+        return self.frame.iloc[rows.index[0]:rows.index[-1] + 1]
+
+    # --- Leaderboard for display: best rank first, with movement and trend columns ---
+    def movement_table(self, week, league):
+        rows = self.table.slice(week, league)
+        standings = self.slice(week, league)
+        table = pd.DataFrame({
+            "Rank": standings["Rank"].to_numpy(),
+            "": standings["Move"].to_numpy(),
+            "Team": rows["Team Name"].astype(object).to_numpy(),
+            "%": rows["% Distance Covered"].to_numpy(),
+            "Δ pts": standings["Change"].to_numpy(),
+            "Best Week": standings["Best Week"].to_numpy(),
+        })
+        return table.iloc[::-1].reset_index(drop=True)
@@ -0,0 +1,140 @@
+# ============================== #
+#        STORAGE BACKENDS       #
+# ============================== #
+
+# Readers for the league results, picked by file extension. Every backend
+# returns the same columns as data.csv and can restrict the read to a subset
+# of columns and weeks.
+#
+#   .csv              text, parsed with pandas
+#   .arrow / .feather Arrow IPC, read through a memory map with no text
+#                     parsing; the page still validates and sorts its own
+#                     copy, so this speeds up loads but saves no memory
+#   .parquet          compressed columnar archive with per-week row groups
+
+import json
+import os
+
+import pandas as pd
+
+RESULT_COLUMNS = ["League Number", "League", "Team Name", "% Distance Covered", "Category", "Week"]
+DICTIONARY_COLUMNS = ["League", "Team Name", "Category"]
+
+# --- Schema metadata key holding {week: [record batch indexes]} ---
+WEEK_INDEX_KEY = b"lionheart.week_batches"
+
+_backends = {}
+
+
+def register_backend(*suffixes):
+    def register(cls):
+        for suffix in suffixes:
+            _backends[suffix] = cls()
+        return cls
+    return register
+
+
+def backend_for(path):
+    if not isinstance(path, (str, os.PathLike)):
+        return _backends[".csv"]
+    suffix = os.path.splitext(os.fspath(path))[1].lower()
+    try:
+        return _backends[suffix]
+    except KeyError:
+        raise ValueError(f"No storage backend for {suffix!r} files: {path}") from None
+
+
+def _filter_weeks(df, weeks):
+    if weeks is None:
+        return df
+    return df[df["Week"].isin(list(weeks))].reset_index(drop=True)
+
+
+@register_backend(".csv")
+class CsvBackend:
+    def read(self, path, columns=None, weeks=None):
+        usecols = None
+        if columns is not None:
+            # Week is needed to filter even when the caller doesn't ask for it
+            usecols = list(columns) + (["Week"] if weeks is not None and "Week" not in columns else [])
+        df = _filter_weeks(pd.read_csv(path, usecols=usecols), weeks)
+        return df[list(columns)] if columns is not None else df
+
+    def write(self, df, path):
+        df.to_csv(path, index=False)
+
+
+@register_backend(".arrow", ".feather")
+class ArrowBackend:
+    def read(self, path, columns=None, weeks=None):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        source = pa.memory_map(os.fspath(path), "r")
+        reader = pa.ipc.open_file(source)
+        metadata = reader.schema.metadata or {}
+        week_index = json.loads(metadata[WEEK_INDEX_KEY]) if WEEK_INDEX_KEY in metadata else None
+
+        if weeks is not None and week_index is not None:
+            batches = [reader.get_batch(i) for week in sorted(int(w) for w in weeks)
+                       for i in week_index.get(str(week), [])]
+            table = pa.Table.from_batches(batches, schema=reader.schema)
+        else:
+            table = reader.read_all()
+            if weeks is not None:
+                table = table.filter(pc.is_in(table["Week"], value_set=pa.array(list(weeks), table.schema.field("Week").type)))
+
+        if columns is not None:
+            table = table.select(list(columns))
+        # Numeric columns come across without copying; dictionary columns become categoricals
+        return table.to_pandas(split_blocks=True)
+
+    # --- One uncompressed record batch per week, so reads can map just the weeks they need ---
+    def write(self, df, path):
+        import pyarrow as pa
+
+        table = _to_arrow(df)
+        batches, week_index = [], {}
+        for week in sorted(df["Week"].unique()):
+            week_table = table.filter(pa.compute.equal(table["Week"], week)).combine_chunks()
+            for batch in week_table.to_batches():
+                week_index.setdefault(str(int(week)), []).append(len(batches))
+                batches.append(batch)
+        schema = table.schema.with_metadata({WEEK_INDEX_KEY: json.dumps(week_index).encode()})
+        tmp_path = f"{path}.tmp"
+        with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch.cast(schema))
+        os.replace(tmp_path, path)
+
+
+@register_backend(".parquet")
+class ParquetBackend:
+    def read(self, path, columns=None, weeks=None):
+        import pyarrow.parquet as pq
+
+        filters = [("Week", "in", [int(week) for week in weeks])] if weeks is not None else None
+        table = pq.read_table(path, columns=list(columns) if columns is not None else None,
+                              filters=filters, memory_map=True)
+        return table.to_pandas(split_blocks=True)
+
+    def write(self, df, path):
+        import pyarrow.parquet as pq
+
+        table = _to_arrow(df.sort_values("Week", kind="mergesort"))
+        tmp_path = f"{path}.tmp"
+        # Row group boundaries follow weeks closely enough for the Week filter to skip most groups
+        rows_per_week = max(1, int(df.groupby("Week").size().max()))
+        pq.write_table(table, tmp_path, compression="zstd", row_group_size=rows_per_week)
+        os.replace(tmp_path, path)
+
+
+def _to_arrow(df):
+    import pyarrow as pa
+
+    df = df[RESULT_COLUMNS].reset_index(drop=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for column in DICTIONARY_COLUMNS:
+        i = table.schema.get_field_index(column)
+        table = table.set_column(i, column, table[column].cast(pa.string()).dictionary_encode())
+    return table
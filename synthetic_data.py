@@ -0,0 +1,53 @@
+# ============================== #
+#        SYNTHETIC RESULTS      #
+# ============================== #
+
+# Results shaped like data.csv at any size, for bench.py and loadtest.py. Kept
+# apart from bench.py so the load test can build its data without importing
+# matplotlib into the process whose memory it reports.
+
+import math
+import os
+import subprocess
+
+import numpy as np
+import pandas as pd
+
+from storage import RESULT_COLUMNS
+
+CATEGORIES = ["One", "Two", "Three", "Four"]
+
+
+# --- Results shaped like data.csv; league numbers cycle over the icon folders on disk ---
+def synthesize(rows=None, leagues=4, teams=None, weeks=None, seed=0):
+    weeks = weeks or 4
+    if teams is None:
+        teams = max(1, math.ceil(rows / (leagues * weeks)))
+    rng = np.random.default_rng(seed)
+    icon_sets = sorted(int(name) for name in os.listdir("images") if name.isdigit()) or [1]
+
+    frames = []
+    for league_index in range(leagues):
+        number = icon_sets[league_index % len(icon_sets)]
+        name = f"Synthetic League {league_index + 1} - Target: {200 + 50 * league_index} miles"
+        team_names = [f"Team {league_index + 1}-{t + 1:05d}" for t in range(teams)]
+        # Weekly progress grows roughly linearly, with a few runaway teams well past 100%
+        pace = rng.gamma(4.0, 8.0, size=teams)
+        for week in range(1, weeks + 1):
+            frames.append(pd.DataFrame({
+                "League Number": number,
+                "League": name,
+                "Team Name": team_names,
+                "% Distance Covered": np.round(pace * week + rng.normal(0, 2, size=teams).clip(0), 2),
+                "Category": [CATEGORIES[t % len(CATEGORIES)] for t in range(teams)],
+                "Week": week,
+            }))
+    return pd.concat(frames, ignore_index=True)[RESULT_COLUMNS]
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,127 @@
+# ============================== #
+#          TEAM SEARCH          #
+# ============================== #
+
+# Name index over the results, built once per data version (see
+# LeagueTable.team_index), so a visitor can jump to their own team without
+# every league being drawn first. Names are matched normalised: case, accents,
+# punctuation and stray spaces ("The Specials ") are ignored. A query matches
+# the start of a name or of any word in it ("spec" finds "The Specials").
+# When nothing matches, prefixes within an edit or two of the query are
+# tried, so small typos still land.
+
+import bisect
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+# --- Fuzzy fallback: no typos allowed under 4 characters, one up to 7, two beyond ---
+FUZZY_MIN_LENGTH = 4
+FUZZY_LONG_LENGTH = 8
+
+
+def normalise(name):
+    text = unicodedata.normalize("NFKD", str(name))
+    text = "".join(char for char in text if not unicodedata.combining(char)).casefold()
+    return " ".join(re.sub(r"[^\w]+", " ", text).split())
+
+
+# --- Levenshtein distance, or None once it must exceed limit ---
+def _distance(a, b, limit):
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= limit else None
+
+
+class TeamIndex:
+    def __init__(self, table):
+        self.table = table
+        frame = table.frame
+        history = pd.DataFrame({
+            "team": frame["Team Name"].astype(object).to_numpy(),
+            "league": frame["League"].astype(object).to_numpy(),
+            "week": frame["Week"].to_numpy(),
+        })
+        # Frame rows run in week order, so the last row per (League, Team Name) is the team's latest week
+        latest = history.drop_duplicates(subset=["team", "league"], keep="last")
+        self.entries = [(team, league, int(week)) for team, league, week in
+                        zip(latest["team"], latest["league"], latest["week"])]
+        self._weeks = history.groupby(["team", "league"], sort=False)["week"].agg(lambda weeks: sorted(set(weeks)))
+
+        # --- Sorted (key, entry) pairs: the whole name and every word-start suffix of it ---
+        keys = []
+        for entry_id, (team, _, _) in enumerate(self.entries):
+            words = normalise(team).split()
+            for start in range(len(words)):
+                keys.append((" ".join(words[start:]), start, entry_id))
+        keys.sort()
+        self._keys = [key for key, _, _ in keys]
+        self._postings = [(start, entry_id) for _, start, entry_id in keys]
+
+    def __len__(self):
+        return len(self.entries)
+
+    # --- Entry ids whose name (or a word in it) starts with query, whole-name matches first ---
+    def _prefix(self, query):
+        found = []
+        position = bisect.bisect_left(self._keys, query)
+        while position < len(self._keys) and self._keys[position].startswith(query):
+            start, entry_id = self._postings[position]
+            found.append((start, len(self._keys[position]), entry_id))
+            position += 1
+        return [entry_id for _, _, entry_id in sorted(found)]
+
+    def _fuzzy(self, query):
+        limit = 1 if len(query) < FUZZY_LONG_LENGTH else 2
+        found = []
+        for key, (start, entry_id) in zip(self._keys, self._postings):
+            # Compare against the key's prefix at lengths the allowed edits could produce
+            best = None
+            for length in range(max(1, len(query) - limit), len(query) + limit + 1):
+                distance = _distance(query, key[:length], limit)
+                if distance is not None and (best is None or distance < best):
+                    best = distance
+            if best is not None:
+                found.append((best, start, len(key), entry_id))
+        return [entry_id for _, _, _, entry_id in sorted(found)]
+
+    # --- Up to limit matches for query, best first ---
+    def search(self, query, limit=10):
+        query = normalise(query)
+        if not query:
+            return []
+        entry_ids = self._prefix(query)
+        if not entry_ids and len(query) >= FUZZY_MIN_LENGTH:
+            entry_ids = self._fuzzy(query)
+        matches = []
+        for entry_id in dict.fromkeys(entry_ids):
+            team, league, week = self.entries[entry_id]
+            matches.append({"team": team, "league": league, "week": week})
+            if len(matches) == limit:
+                break
+        return matches
+
+    # --- Weeks team has a result in for league, in order ---
+    def weeks(self, team, league):
+        return [int(week) for week in self._weeks.get((team, league), [])]
+
+    # --- Rank, teams in the league and % covered for team in week, or None if it has no row then ---
+    def standing(self, team, league, week):
+        rows = self.table.slice(week, league)
+        position = np.flatnonzero(rows["Team Name"].astype(object).to_numpy() == team)
+        if not len(position):
+            return None
+        standings = self.table.standings.slice(week, league)
+        return {
+            "rank": int(standings["Rank"].iloc[position[0]]),
+            "teams": len(rows),
+            "pct": float(rows["% Distance Covered"].iloc[position[0]]),
+        }
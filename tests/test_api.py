@@ -0,0 +1,102 @@
+import gzip
+import http.client
+import json
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from api_server import LeagueApi, make_handler
+from ingest import DataIngestor
+from league_data import PAGE_COLUMNS
+
+MIXED = "Mixed League - Target: 281 miles"
+SHARED = "Mixed League (Juniors) - Target: 281 miles"
+CYCLING = "Cycling League - Target: 782 miles"
+ROWS = [
+    (1, MIXED, "Voyagers", 142, "Open", 1),
+    (1, MIXED, "The Specials", 120, "Open", 1),
+    (1, SHARED, "Quantem London", 90, "Youth", 1),
+    (2, CYCLING, "Spokes", 60, "Open", 1),
+    (1, MIXED, "Voyagers", 150, "Open", 2),
+    (1, MIXED, "The Specials", 160, "Open", 2),
+]
+
+
+@pytest.fixture
+def api(tmp_path):
+    path = tmp_path / "data.csv"
+    lines = ["League Number,League,Team Name,% Distance Covered,Category,Week"]
+    # Padded team lists, so the week bodies are big enough to be gzipped
+    lines += [f'{number},"{league}",{team},{pct},{category},{week}' for number, league, team, pct, category, week in ROWS]
+    lines += [f'2,"{CYCLING}",Rider {n},{n},Open,1' for n in range(20)]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return LeagueApi(DataIngestor(str(path), drop_dir=None, poll_interval=0, columns=PAGE_COLUMNS, images_dir=None))
+
+
+@pytest.fixture
+def server(api):
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(api))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def get(address, path, **headers):
+    connection = http.client.HTTPConnection(*address, timeout=10)
+    connection.request("GET", path, headers=headers)
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    return response, body
+
+
+def test_league_body_is_always_a_list_of_leagues(api):
+    status, content_type, (body, _, _) = api.respond("/api/weeks/1/leagues/2.json")
+    assert status == 200 and content_type == "application/json"
+    document = json.loads(body)
+    assert document["week"] == 1
+    assert [league["league"] for league in document["leagues"]] == [CYCLING]
+
+    # Leagues that share a League Number both come back, in the same shape
+    _, _, (body, _, _) = api.respond("/api/weeks/1/leagues/1.json")
+    leagues = json.loads(body)["leagues"]
+    assert sorted(league["league"] for league in leagues) == sorted([MIXED, SHARED])
+    mixed = next(league for league in leagues if league["league"] == MIXED)
+    assert [team["team"] for team in mixed["teams"]] == ["Voyagers", "The Specials"]
+    assert [team["rank"] for team in mixed["teams"]] == [1, 2]
+
+
+def test_week_csv_and_unknown_paths(api):
+    status, content_type, (body, _, _) = api.respond("/api/weeks/2.csv")
+    assert status == 200 and content_type.startswith("text/csv")
+    lines = body.decode().splitlines()
+    assert lines[0].startswith("Week,League,League Number,Rank,Team Name")
+    assert len(lines) == 3
+
+    assert api.respond("/api/weeks/9.json")[0] == 404
+    assert api.respond("/api/weeks/2/leagues/2.json")[0] == 404
+    assert api.respond("/api/nowhere")[0] == 404
+
+
+def test_gzip_body_has_its_own_etag_and_either_revalidates(server):
+    plain, plain_body = get(server, "/api/weeks/1.json")
+    zipped, zipped_body = get(server, "/api/weeks/1.json", **{"Accept-Encoding": "gzip"})
+    assert plain.status == zipped.status == 200
+    assert zipped.getheader("Content-Encoding") == "gzip"
+    assert gzip.decompress(zipped_body) == plain_body
+
+    etag, gz_etag = plain.getheader("ETag"), zipped.getheader("ETag")
+    assert gz_etag == etag[:-1] + '-gz"'
+
+    for tag in (etag, gz_etag, f"W/{gz_etag}"):
+        response, body = get(server, "/api/weeks/1.json", **{"If-None-Match": tag, "Accept-Encoding": "gzip"})
+        assert response.status == 304 and body == b""
+        assert response.getheader("ETag") == gz_etag
+    response, _ = get(server, "/api/weeks/1.json", **{"If-None-Match": '"stale"'})
+    assert response.status == 200
+
+    response, body = get(server, "/api/weeks/7.json")
+    assert response.status == 404 and "error" in json.loads(body)
@@ -0,0 +1,85 @@
+import os
+
+import pandas as pd
+
+from ingest import DataIngestor
+from league_data import PAGE_COLUMNS
+
+HEADER = "League Number,League,Team Name,% Distance Covered,Category,Week\n"
+LEAGUE = '"Mixed League - Target: 281 miles"'
+ROWS = [
+    f"1,{LEAGUE},Voyagers,142,One,1",
+    f"1,{LEAGUE},The Specials,120,Two,1",
+    f"1,{LEAGUE},Quantem London,90,Three,1",
+]
+
+
+def write(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    # Distinct mtimes, so each write is seen as a change
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def ingestor_for(path):
+    return DataIngestor(str(path), drop_dir=None, poll_interval=0, columns=PAGE_COLUMNS, images_dir=None)
+
+
+def teams(table, week=1):
+    return sorted(table.week_frame(week)["Team Name"].astype(object))
+
+
+def test_full_load_keeps_last_row_without_newline(tmp_path):
+    path = tmp_path / "data.csv"
+    write(path, HEADER + "\n".join(ROWS))
+    ingestor = ingestor_for(path)
+    assert len(ingestor.table) == len(pd.read_csv(path)) == 3
+    assert "Quantem London" in teams(ingestor.table)
+
+
+def test_rows_appended_after_unterminated_last_row(tmp_path):
+    path = tmp_path / "data.csv"
+    write(path, HEADER + "\n".join(ROWS))
+    ingestor = ingestor_for(path)
+    write(path, HEADER + "\n".join(ROWS) + f"\n1,{LEAGUE},Night Owls,75,Four,1\n")
+    table = ingestor.snapshot()
+    assert ingestor.appends == 1
+    assert teams(table) == ["Night Owls", "Quantem London", "The Specials", "Voyagers"]
+
+
+def test_unterminated_row_finished_later_is_read_again(tmp_path):
+    path = tmp_path / "data.csv"
+    write(path, HEADER + "\n".join(ROWS[:2]) + f"\n1,{LEAGUE},Quantem London,9")
+    ingestor = ingestor_for(path)
+    write(path, HEADER + "\n".join(ROWS) + "\n")
+    table = ingestor.snapshot()
+    assert teams(table) == ["Quantem London", "The Specials", "Voyagers"]
+    rows = table.week_frame(1)
+    assert rows.loc[rows["Team Name"] == "Quantem London", "% Distance Covered"].tolist() == [90]
+
+
+def assert_matches_reload(ingestor, path):
+    reloaded = ingestor_for(path).table.frame
+    appended = ingestor.snapshot().frame
+    pd.testing.assert_frame_equal(appended.astype({"League": object, "Team Name": object, "Category": object}),
+                                  reloaded.astype({"League": object, "Team Name": object, "Category": object}))
+
+
+def test_resubmitted_week_matches_reload(tmp_path):
+    path = tmp_path / "data.csv"
+    write(path, HEADER + "\n".join(ROWS) + "\n")
+    ingestor = ingestor_for(path)
+    write(path, HEADER + "\n".join(ROWS) + f"\n1,{LEAGUE},quantem london ,150,Three,1\n")
+    assert_matches_reload(ingestor, path)
+    rows = ingestor.table.week_frame(1)
+    assert rows.loc[rows["Team Name"] == "Quantem London", "% Distance Covered"].tolist() == [150]
+
+
+def test_new_spelling_in_a_later_week_matches_reload(tmp_path):
+    path = tmp_path / "data.csv"
+    write(path, HEADER + "\n".join(ROWS) + "\n")
+    ingestor = ingestor_for(path)
+    write(path, HEADER + "\n".join(ROWS) + f"\n1,{LEAGUE},the specials,160,Two,2\n")
+    assert_matches_reload(ingestor, path)
+    assert teams(ingestor.table, week=2) == ["The Specials"]
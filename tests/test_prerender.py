@@ -0,0 +1,9 @@
+from prerender import chart_filename
+
+
+def test_leagues_sharing_a_number_get_their_own_files():
+    # bench.synthesize reuses League Numbers beyond four leagues, as real seasons may
+    first = chart_filename(1, "Synthetic League 1 - Target: 300 miles", "png")
+    fifth = chart_filename(1, "Synthetic League 5 - Target: 300 miles", "png")
+    assert first != fifth
+    assert chart_filename(1, "Synthetic League 1 - Target: 300 miles", "png") == first
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from league_data import LeagueTable
+from rollups import BOARD_COLUMNS
+
+MIXED = "Mixed League - Target: 281 miles"
+CYCLING = "Cycling League - Target: 782 miles"
+
+
+def table():
+    return LeagueTable(pd.DataFrame({
+        "League Number": [1, 1, 1, 2, 2, 1, 1, 1, 2, 2],
+        "League": [MIXED, MIXED, MIXED, CYCLING, CYCLING, MIXED, MIXED, MIXED, CYCLING, CYCLING],
+        "Team Name": ["Owls", "Larks", "Wrens", "Spokes", "Chains",
+                      "Owls", "Larks", "Wrens", "Spokes", "Chains"],
+        "Category": ["Open", "Open", "Youth", "Open", "Youth",
+                     "Open", "Open", "Youth", "Open", "Youth"],
+        "% Distance Covered": [40.0, 90.0, 20.0, 110.0, 60.0,
+                               100.0, 120.0, 30.0, 80.0, 70.0],
+        "Week": [1, 1, 1, 1, 1, 2, 2, 2, 2, 2],
+    }))
+
+
+def test_league_board_totals_for_chosen_week():
+    board = table().rollups.board("League", 2)
+    assert list(board.columns) == [column if column != "Group" else "League" for column in BOARD_COLUMNS]
+    assert list(board["League"]) == [MIXED, CYCLING]
+    assert list(board["Rank"]) == [1, 2]
+    assert list(board["Teams"]) == [3, 2]
+
+    mixed, cycling = board.iloc[0], board.iloc[1]
+    assert np.isclose(mixed["Mean"], 250 / 3)
+    assert mixed["Median"] == 100.0
+    assert np.isclose(mixed["≥ 85%"], 200 / 3)
+    assert np.isclose(mixed["≥ 100%"], 200 / 3)
+    assert np.isclose(mixed["Δ Mean"], 250 / 3 - 50)
+    assert np.isclose(mixed["Δ ≥ 100%"], 200 / 3)
+
+    assert cycling["Mean"] == 75.0
+    assert cycling["≥ 85%"] == 0.0
+    assert cycling["Δ Mean"] == -10.0
+    assert cycling["Δ ≥ 100%"] == -50.0
+
+
+def test_category_board_and_first_week_has_no_change():
+    rollups = table().rollups
+    first = rollups.board("Category", 1)
+    assert list(first["Category"]) == ["Open", "Youth"]
+    assert list(first["Teams"]) == [3, 2]
+    assert first["Δ Mean"].isna().all()
+
+    second = rollups.board("Category", 2)
+    assert list(second["Mean"]) == [100.0, 50.0]
+    assert list(second["Δ Mean"]) == [20.0, 10.0]
+
+
+def test_missing_week_gives_an_empty_board():
+    board = table().rollups.board("League", 9)
+    assert board.empty
+    assert "League" in board.columns
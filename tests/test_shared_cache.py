@@ -0,0 +1,27 @@
+import pytest
+
+from shared_cache import DiskBackend, KeyValueBackend, MemoryBackend, SharedCache
+
+
+@pytest.fixture(params=["memory", "disk"])
+def backend(request, tmp_path):
+    return MemoryBackend() if request.param == "memory" else DiskBackend(str(tmp_path))
+
+
+def test_unlock_leaves_a_lock_taken_over_by_another_replica(backend):
+    first, second = SharedCache(backend), SharedCache(backend)
+    assert first.try_lock("chart", 1)
+    # first's lock outlives lock_ttl and second takes it over
+    backend.delete(first._key("lock:chart", 1))
+    assert second.try_lock("chart", 1)
+
+    first.unlock("chart", 1)
+    assert not first.try_lock("chart", 1)
+    second.unlock("chart", 1)
+    assert first.try_lock("chart", 1)
+
+
+def test_kv_backend_needs_an_authkey(monkeypatch):
+    monkeypatch.delenv("LIONHEART_CACHE_AUTHKEY", raising=False)
+    with pytest.raises(RuntimeError):
+        KeyValueBackend(("127.0.0.1", 6380))
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from league_data import LeagueTable
+
+LEAGUES = ["North League - Target: 100 miles", "South League - Target: 200 miles"]
+
+
+def results(seed, weeks=5, teams=6):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for league_number, league in enumerate(LEAGUES, 1):
+        # Gains in whole steps of 10, so teams often tie with their own best week
+        progress = np.cumsum(rng.integers(0, 4, size=(teams, weeks)) * 10, axis=1)
+        for team in range(teams):
+            for week in range(1, weeks + 1):
+                if rng.random() < 0.15:
+                    continue
+                rows.append({"League Number": league_number, "League": league, "Team Name": f"Team {team}",
+                             "% Distance Covered": float(progress[team, week - 1]), "Week": week})
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.parametrize("seed", range(40))
+@pytest.mark.parametrize("first_new_week", [2, 4, 5])
+def test_extend_matches_full_recompute(seed, first_new_week):
+    rows = results(seed)
+    old, new = rows[rows["Week"] < first_new_week], rows[rows["Week"] >= first_new_week]
+    table = LeagueTable(old)
+    table.standings  # built before extend, so extend carries it forward from the seed
+    extended = table.extend(new).standings.frame
+    pd.testing.assert_frame_equal(extended, LeagueTable(rows).standings.frame)
+
+
+def test_tied_gain_takes_the_later_week():
+    rows = pd.DataFrame({
+        "League Number": 1, "League": LEAGUES[0], "Team Name": "Team 0",
+        "% Distance Covered": [10.0, 20.0, 30.0], "Week": [1, 2, 3],
+    })
+    table = LeagueTable(rows[rows["Week"] < 3])
+    table.standings
+    assert table.extend(rows[rows["Week"] == 3]).standings.frame["Best Week"].tolist() == [1, 2, 3]
+    assert LeagueTable(rows).standings.frame["Best Week"].tolist() == [1, 2, 3]
@@ -0,0 +1,38 @@
+import pandas as pd
+
+from league_data import LeagueTable
+
+LEAGUE = "Mixed League - Target: 281 miles"
+OTHER = "Cycling League - Target: 782 miles"
+
+
+def table():
+    return LeagueTable(pd.DataFrame({
+        "League Number": [1, 1, 1, 2, 1, 1, 1],
+        "League": [LEAGUE, LEAGUE, LEAGUE, OTHER, LEAGUE, LEAGUE, LEAGUE],
+        "Team Name": ["The Specials", "Voyagers", "Night Owls", "Spokes", "The Specials", "Voyagers", "Night Owls"],
+        "% Distance Covered": [40.0, 55.0, 20.0, 30.0, 90.0, 80.0, 35.0],
+        "Week": [1, 1, 1, 1, 2, 2, 2],
+    }))
+
+
+def test_prefix_matches_whole_names_and_words():
+    index = table().team_index
+    assert [match["team"] for match in index.search("spe")] == ["The Specials"]
+    assert [match["team"] for match in index.search("the spec")] == ["The Specials"]
+    assert index.search("voyagers")[0] == {"team": "Voyagers", "league": LEAGUE, "week": 2}
+    assert {match["team"] for match in index.search("s")} >= {"Spokes", "The Specials"}
+
+
+def test_fuzzy_match_forgives_a_typo_but_not_short_queries():
+    index = table().team_index
+    assert [match["team"] for match in index.search("voyagres")] == ["Voyagers"]
+    assert index.search("xyz") == []
+
+
+def test_weeks_and_standing_for_any_week():
+    index = table().team_index
+    assert index.weeks("The Specials", LEAGUE) == [1, 2]
+    assert index.standing("The Specials", LEAGUE, 1) == {"rank": 2, "teams": 3, "pct": 40.0}
+    assert index.standing("The Specials", LEAGUE, 2) == {"rank": 1, "teams": 3, "pct": 90.0}
+    assert index.standing("Spokes", OTHER, 2) is None
@@ -0,0 +1,180 @@
+# ============================== #
+#      VALIDATION AT INGEST     #
+# ============================== #
+
+# Cleans results once, as they are loaded, so nothing downstream has to
+# guess at render time:
+#
+#   headers      BOM and stray spaces stripped (a UTF-8 BOM on "League Number")
+#   text         names trimmed and inner spaces collapsed ("The Specials ");
+#                spellings of one team that differ only in case, spacing or
+#                punctuation are merged into the most common one
+#   types        League Number and Week as small ints, % as float; rows
+#                that cannot be parsed are dropped
+#   duplicates   one row per (League, Team Name, Week), the last one wins
+#   leagues      one League Number per league; the number its first row
+#                gives wins
+#   targets      "Target Miles" parsed out of the league name
+#   icons        every League Number has a runner icon folder
+#
+# Percentages above 100 are kept (teams can pass their target) and only
+# counted. Each load gets a ValidationReport; run it on a file by hand:
+#
+#   python validate.py data.csv
+
+import argparse
+import json
+import logging
+import re
+
+import pandas as pd
+
+from icons import IMAGES_DIR, league_image_paths
+from team_search import normalise
+
+logger = logging.getLogger(__name__)
+
+TEXT_COLUMNS = ["League", "Team Name", "Category"]
+TARGET_COLUMN = "Target Miles"
+TARGET_PATTERN = re.compile(r"Target:\s*([\d,]+(?:\.\d+)?)\s*miles", re.IGNORECASE)
+
+
+class ValidationReport:
+    def __init__(self):
+        self.rows_in = 0
+        self.rows_out = 0
+        self.issues = {}
+
+    # --- Tally count under (level, message); level is "error", "warning" or "info" ---
+    def add(self, level, message, count=1):
+        if count:
+            self.issues[(level, message)] = self.issues.get((level, message), 0) + int(count)
+
+    def extend(self, other):
+        self.rows_in += other.rows_in
+        self.rows_out += other.rows_out
+        for (level, message), count in other.issues.items():
+            self.add(level, message, count)
+        return self
+
+    @property
+    def ok(self):
+        return not any(level == "error" for level, _ in self.issues)
+
+    def to_dict(self):
+        return {
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "issues": [{"level": level, "message": message, "count": count}
+                       for (level, message), count in self.issues.items()],
+        }
+
+    def log(self, source):
+        for (level, message), count in self.issues.items():
+            if level != "info":
+                logger.warning("%s: %s (%d)", source, message, count)
+
+
+def _clean_text(series):
+    return series.astype(object).map(lambda value: " ".join(str(value).split()) if pd.notna(value) else value)
+
+
+# --- Most common spelling per normalised team name within a league ---
+def _merge_spellings(df, report):
+    keys = df["Team Name"].map(normalise)
+    spellings = pd.DataFrame({"League": df["League"], "key": keys, "name": df["Team Name"]})
+    counts = spellings.groupby(["League", "key", "name"], sort=False).size().reset_index(name="n")
+    # Stable sort keeps first appearance ahead among equally common spellings
+    canonical = counts.sort_values("n", ascending=False, kind="stable").drop_duplicates(["League", "key"])
+    variants = len(counts) - len(canonical)
+    if not variants:
+        return df
+    report.add("warning", "team name spellings merged into the most common one", variants)
+    lookup = canonical.set_index(["League", "key"])["name"]
+    index = pd.MultiIndex.from_arrays([spellings["League"], spellings["key"]])
+    return df.assign(**{"Team Name": lookup.reindex(index).to_numpy()})
+
+
+# --- Clean copy of df and its report; images_dir=None skips the icon folder check ---
+def clean(df, images_dir=IMAGES_DIR, report=None):
+    report = report or ValidationReport()
+    report.rows_in += len(df)
+    df = df.rename(columns=lambda column: str(column).lstrip("\ufeff").strip())
+
+    for column in [column for column in TEXT_COLUMNS if column in df.columns]:
+        raw = df[column].astype(object)
+        df[column] = _clean_text(raw)
+        report.add("info", f"{column} values trimmed", (raw.notna() & (raw != df[column])).sum())
+
+    # --- Types: unparseable rows are dropped rather than charted as zeros ---
+    for column, dtype in (("League Number", "int16"), ("Week", "int16"), ("% Distance Covered", "float64")):
+        if column not in df.columns:
+            continue
+        values = pd.to_numeric(df[column], errors="coerce")
+        bad = values.isna()
+        if column != "% Distance Covered":
+            bad |= values.notna() & (values != values.round())
+        if bad.any():
+            report.add("error", f"rows dropped: {column} missing or not a number", bad.sum())
+            df, values = df[~bad], values[~bad]
+        df[column] = values.astype(dtype)
+    for column in [column for column in ("League", "Team Name") if column in df.columns]:
+        missing = df[column].isna() | (df[column] == "")
+        if missing.any():
+            report.add("error", f"rows dropped: {column} empty", missing.sum())
+            df = df[~missing]
+    if "% Distance Covered" in df.columns:
+        negative = df["% Distance Covered"] < 0
+        if negative.any():
+            report.add("error", "rows dropped: negative % Distance Covered", negative.sum())
+            df = df[~negative]
+        report.add("info", "rows above 100% of target", (df["% Distance Covered"] > 100).sum())
+
+    if {"League", "Team Name"} <= set(df.columns):
+        df = _merge_spellings(df, report)
+        if "Week" in df.columns:
+            duplicated = df.duplicated(subset=["League", "Team Name", "Week"], keep="last")
+            if duplicated.any():
+                report.add("warning", "duplicate (League, Team Name, Week) rows dropped, last kept", duplicated.sum())
+                df = df[~duplicated]
+
+    if {"League", "League Number"} <= set(df.columns):
+        numbers = df.drop_duplicates(subset=["League"]).set_index("League")["League Number"]
+        conflicting = df["League Number"].to_numpy() != numbers.reindex(df["League"]).to_numpy()
+        if conflicting.any():
+            report.add("warning", "League Number disagrees with the league's first row; first row's used",
+                       conflicting.sum())
+            df = df.assign(**{"League Number": numbers.reindex(df["League"]).to_numpy()})
+        if images_dir is not None:
+            for number in sorted(set(numbers)):
+                if not league_image_paths(number, images_dir):
+                    report.add("error", f"no runner icons in {images_dir}/{number}/ (league charts will be blank)")
+
+    # --- Target mileage, parsed once per league rather than per row ---
+    if "League" in df.columns:
+        leagues = pd.Series(df["League"].unique())
+        targets = leagues.str.extract(TARGET_PATTERN, expand=False).str.replace(",", "").astype("float32")
+        for league in leagues[targets.isna()]:
+            report.add("warning", f"no \"Target: N miles\" in league name {league!r}")
+        df = df.assign(**{TARGET_COLUMN: targets.set_axis(leagues).reindex(df["League"]).to_numpy()})
+
+    df = df.reset_index(drop=True)
+    report.rows_out += len(df)
+    return df, report
+
+
+def main(argv=None):
+    from league_data import load_data
+
+    parser = argparse.ArgumentParser(description="Validate a league results file and report what cleaning would change.")
+    parser.add_argument("path", nargs="?", default="data.csv", help="results file (default: data.csv)")
+    parser.add_argument("--images", default=IMAGES_DIR, help=f"runner icon folder (default: {IMAGES_DIR})")
+    args = parser.parse_args(argv)
+
+    _, report = clean(load_data(args.path), images_dir=args.images)
+    print(json.dumps(report.to_dict(), indent=2))
+    raise SystemExit(0 if report.ok else 1)
+
+
+if __name__ == "__main__":
+    main()